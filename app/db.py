@@ -13,6 +13,7 @@ LastEditTime: 2026-01-08 09:53:01
 import time
 import uuid
 from tortoise import Tortoise, fields
+from tortoise.transactions import in_transaction
 from tortoise.models import Model
 
 
@@ -28,6 +29,8 @@ class File(Model):
     class Meta:
         table = "files"
         unique_together = (("user_id", "path"),)
+        # 按用户 + 修改时间筛选/排序；(user_id, path) 已由唯一索引覆盖
+        indexes = (("user_id", "mtime"),)
 
 
 class Schema(Model):
@@ -40,12 +43,26 @@ class Schema(Model):
 
     class Meta:
         table = "schemas"
+        # 按用户列出 / 按名称查找 schema
+        indexes = (("user_id", "name"),)
+
+
+# SQLite 连接参数：WAL + NORMAL 同步、64MB 页缓存、256MB mmap、临时表放内存
+# 以 URL 参数传入，Tortoise 在每次建立连接时逐条执行 PRAGMA
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
 
 
 async def init_db(db_path: str):
     """初始化数据库"""
+    pragmas = "&".join(f"{k}={v}" for k, v in SQLITE_PRAGMAS.items())
     await Tortoise.init(
-        db_url=f"sqlite://{db_path}",
+        db_url=f"sqlite://{db_path}?{pragmas}",
         modules={"models": ["db"]},
     )
     await Tortoise.generate_schemas()
@@ -58,10 +75,17 @@ async def close_db():
 
 async def ensure_root_directory(user_id: str):
     """确保根目录存在"""
-    if not await File.filter(user_id=user_id, path="/").exists():
-        await File.create(
-            user_id=user_id,
-            path="/",
-            type=2,
-            mtime=int(time.time() * 1000),
-        )
+    await ensure_root_directories([user_id])
+
+
+async def ensure_root_directories(user_ids: list[str]):
+    """
+    批量确保根目录存在
+    单事务内一次 bulk_create，已存在的记录由 (user_id, path) 唯一约束跳过
+    """
+    if not user_ids:
+        return
+    now = int(time.time() * 1000)
+    objs = [File(user_id=u, path="/", type=2, mtime=now) for u in dict.fromkeys(user_ids)]
+    async with in_transaction():
+        await File.bulk_create(objs, ignore_conflicts=True)
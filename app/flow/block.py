@@ -1,8 +1,13 @@
 import asyncio
+import copy
+import inspect
+from collections.abc import MutableMapping, MutableSequence, MutableSet
 from typing import Dict, List, Any, Optional, Union
 
 
 class Option:
+    __slots__ = ("name", "type", "value", "items", "min", "max", "_base_dict", "_has_value")
+
     def __init__(
         self,
         name: str,
@@ -18,37 +23,144 @@ class Option:
         self.items = items
         self.min = min_val
         self.max = max_val
+        # 除 value 外的导出字段构造后不再变化，预先生成模板
+        self._has_value = opt_type != "Button"
+        self._base_dict = _OPTION_DICT_BUILDERS.get(opt_type, _base_option_dict)(self)
+
+    def copy(self) -> "Option":
+        """复制 Option（items 列表与导出模板按只读约定共享，不重新构造）"""
+        o = object.__new__(Option)
+        o.name = self.name
+        o.type = self.type
+        # 列表/字典类型的值各自持有一份，避免实例间互相修改
+        value = self.value
+        o.value = value.copy() if isinstance(value, (list, dict)) else value
+        o.items = self.items
+        o.min = self.min
+        o.max = self.max
+        o._base_dict = self._base_dict
+        o._has_value = self._has_value
+        return o
 
     def to_dict(self) -> Dict[str, Any]:
         """导出为符合前端渲染需求的字典格式"""
-        d = {"name": self.name, "type": self.type}
-
-        if self.type != "Button":
+        d = self._base_dict.copy()
+        if self._has_value:
             d["value"] = self.value
+        return d
 
-        if self.type == "Select" and self.items is not None:
-            d["items"] = self.items
-            d["properties"] = {"items": self.items}
 
-        if self.type in ["Integer", "Number", "Slider"]:
-            if self.min is not None:
-                d["min"] = self.min
-            if self.max is not None:
-                d["max"] = self.max
+def _base_option_dict(opt: Option) -> Dict[str, Any]:
+    # value 先占位，保证导出字段顺序与前端约定一致
+    return {"name": opt.name, "type": opt.type, "value": None}
+
+
+def _button_option_dict(opt: Option) -> Dict[str, Any]:
+    return {"name": opt.name, "type": opt.type}
+
+
+def _select_option_dict(opt: Option) -> Dict[str, Any]:
+    d = _base_option_dict(opt)
+    if opt.items is not None:
+        d["items"] = opt.items
+        d["properties"] = {"items": opt.items}
+    return d
+
+
+def _numeric_option_dict(opt: Option) -> Dict[str, Any]:
+    d = _base_option_dict(opt)
+    if opt.min is not None:
+        d["min"] = opt.min
+    if opt.max is not None:
+        d["max"] = opt.max
+    return d
 
-        return d
+
+_OPTION_DICT_BUILDERS = {
+    "Button": _button_option_dict,
+    "Select": _select_option_dict,
+    "Integer": _numeric_option_dict,
+    "Number": _numeric_option_dict,
+    "Slider": _numeric_option_dict,
+}
+
+
+# 浅拷贝后会在实例间共享的可变容器类型；ndarray 通过 __array_interface__ 识别，避免 flow 依赖 numpy
+_MUTABLE_CONTAINERS = (MutableSequence, MutableMapping, MutableSet)
+
+
+def _is_mutable_container(value: Any) -> bool:
+    return isinstance(value, _MUTABLE_CONTAINERS) or hasattr(value, "__array_interface__")
 
 
 class Block:
+    # 基类属性固定布局；子类未声明 __slots__ 时仍保留 __dict__ 以存放自定义属性
+    __slots__ = (
+        "name",
+        "category",
+        "instance_id",
+        "_inputs",
+        "_outputs",
+        "_options",
+        "_input_names",
+        "_output_names",
+    )
+
+    # 是否为开销可忽略的纯转发/常量节点；仅显式声明的节点在异步执行时内联运行，
+    # 其余同步 on_compute 一律放到线程池，避免阻塞事件循环
+    runs_inline: bool = False
+    # 是否持有可变的自定义状态（列表、缓冲区等）；为 True 时 clone 退回 deepcopy。
+    # 自定义属性中直接含有 list/dict/set/ndarray 时无需声明，clone 会自动退回 deepcopy
+    has_mutable_state: bool = False
+    # on_compute 是否为协程函数，定义子类时计算一次并缓存在类上
+    _is_async: bool = False
+    # 异步调度时能否直接内联同步执行（声明 runs_inline、未覆盖 async_on_compute），无需创建 Task
+    _runs_inline: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._is_async = inspect.iscoroutinefunction(cls.on_compute)
+        cls._runs_inline = (
+            cls.runs_inline
+            and not cls._is_async
+            and cls.async_on_compute is Block.async_on_compute
+        )
+
     def __init__(self, name: str, category: str = None):
         self.name = name
         self.category = category
+        self.instance_id: Optional[str] = None
         self._inputs: Dict[str, Any] = {}
         self._outputs: Dict[str, Any] = {}
         self._options: Dict[str, Option] = {}
         self._input_names: List[str] = []
         self._output_names: List[str] = []
 
+    def clone(self) -> "Block":
+        """
+        基于模板快速创建实例，替代 copy.deepcopy：
+        端口字典按名称重建，Option 写时复制（先与模板共享，set_option 时才复制），其余属性浅拷贝；
+        自定义属性中含可变容器时退回 deepcopy，保证实例之间互不共享
+        """
+        extra = getattr(self, "__dict__", None)
+        if self.has_mutable_state or (
+            extra and any(map(_is_mutable_container, extra.values()))
+        ):
+            return copy.deepcopy(self)
+
+        b = object.__new__(type(self))
+        if extra:
+            b.__dict__.update(extra)
+        b.name = self.name
+        b.category = self.category
+        b.instance_id = self.instance_id
+        b._input_names = list(self._input_names)
+        b._output_names = list(self._output_names)
+        b._inputs = dict.fromkeys(self._input_names)
+        b._outputs = dict.fromkeys(self._output_names)
+        b._options = self._options.copy()
+        return b
+
     def set_interface(self, name: str, value: Any):
         self._outputs[name] = value
 
@@ -129,7 +241,8 @@ class Block:
 
     def set_option(self, name: str, value: Any):
         if name in self._options:
-            opt = self._options[name]
+            # Option 可能与模板或其他实例共享，修改前先复制一份（写时复制）
+            opt = self._options[name] = self._options[name].copy()
             # 数值校验
             if opt.type in ["Integer", "Number", "Slider"]:
                 if opt.min is not None:
@@ -152,7 +265,12 @@ class Block:
         pass
 
     async def async_on_compute(self, execution_id: str = None):
-        await asyncio.to_thread(self.on_compute, execution_id)
+        if self._is_async:
+            await self.on_compute(execution_id)
+        elif self.runs_inline:
+            self.on_compute(execution_id)
+        else:
+            await asyncio.to_thread(self.on_compute, execution_id)
 
     def export_config(self):
         return {
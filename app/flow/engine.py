@@ -1,172 +1,408 @@
 import asyncio
 import copy
-import networkx as nx
-from typing import Any, Dict, List, Tuple
+from contextlib import contextmanager
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Tuple
 from flow.block import Block
 
+# 数据流转指令：(源 outputs.get, 源端口, 目标 inputs 字典, 目标端口)
+Transfer = Tuple[Callable[[str], Any], str, Dict[str, Any], str]
+
 class ComputeEngine:
     def __init__(self):
         self.block_templates: Dict[str, Block] = {}
+        # 模板注册后不再变化，导出配置缓存到下次注册
+        self._exported_blocks: List[Dict] = None
         self.instances: Dict[str, Block] = {}
-        self.on_log = print
-        self._compiled_sequence: List[Tuple[Block, List[Tuple[Block, str, str]]]] = []
+        self._on_log = print
+        self._log_enabled = True
+        # 是否逐节点输出完成日志；高频主循环关闭后仅保留开始/结束/错误日志
+        self.verbose = True
+        # (实例, 计算函数, 数据流转指令 [(源 outputs.get, 源端口, 目标 inputs, 目标端口)], 去重前驱节点 ID)
+        self._compiled_sequence: List[Tuple[Block, Callable, List[Transfer], Tuple[str, ...]]] = []
+        # 与 _compiled_sequence 对齐：每个节点的入度（去重前驱数）与后继节点下标
+        self._in_degrees: List[int] = []
+        self._successors: List[List[int]] = []
+        # 同步快速路径的扁平指令流：[(计算函数, 数据流转指令元组)]，不含日志所需的 Block
+        self._run_steps: List[Tuple[Callable, Tuple[Transfer, ...]]] = []
+        # 与实例无关的链接计划：[(节点 ID, ((源节点 ID, 源端口, 目标端口), ...), 去重前驱节点 ID)]
+        # 编译期生成一次，克隆引擎共享引用，只在 _link 中绑定到各自实例的端口字典
+        self._link_plan: List[Tuple[str, Tuple[Tuple[str, str, str], ...], Tuple[str, ...]]] = []
+
+    def __deepcopy__(self, memo):
+        new = object.__new__(type(self))
+        memo[id(self)] = new
+        for key, value in self.__dict__.items():
+            # 指令表含 dict.get 绑定方法（deepcopy 视为原子对象），由副本实例重新链接
+            if key not in ("_compiled_sequence", "_run_steps"):
+                new.__dict__[key] = copy.deepcopy(value, memo)
+        new._link()
+        return new
 
-    def log(self, msg: str):
-        if self.on_log: self.on_log(f"[Engine] {msg}")
+    def clone(self) -> "ComputeEngine":
+        """
+        基于已编译引擎快速复制，替代 copy.deepcopy：
+        实例逐个 Block.clone，按共享的链接计划重新生成指令表，其余编译结果只读共享
+        """
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.instances = {n_id: b.clone() for n_id, b in self.instances.items()}
+        new._link()
+        return new
+
+    def _link(self):
+        """按链接计划把端口名绑定到当前实例的端口字典，生成执行序列与同步指令流"""
+        instances = self.instances
+        # 直接引用端口字典（reset 原地清空，字典对象在实例生命周期内不变）
+        self._compiled_sequence = []
+        for n_id, links, parent_ids in self._link_plan:
+            instance = instances[n_id]
+            inputs = instance._inputs
+            transfers = [
+                (instances[src_id]._outputs.get, out_p, inputs, in_p)
+                for src_id, out_p, in_p in links
+            ]
+            self._compiled_sequence.append((instance, instance.on_compute, transfers, parent_ids))
+        self._run_steps = [
+            (compute, tuple(transfers)) for _, compute, transfers, _ in self._compiled_sequence
+        ]
+
+    @property
+    def on_log(self):
+        return self._on_log
+
+    @on_log.setter
+    def on_log(self, handler):
+        # 日志开关随处理器同步，运行循环据此跳过 f-string 格式化
+        self._on_log = handler
+        self._log_enabled = bool(handler)
+
+    def set_verbose(self, verbose: bool):
+        self.verbose = verbose
+
+    def log(self, msg: str, *args):
+        # 参数延迟格式化：日志关闭时不构造字符串
+        if self._log_enabled: self._on_log("[Engine] " + (msg % args if args else msg))
+
+    @contextmanager
+    def quiet(self):
+        """临时关闭日志（批量运行时使用），退出后恢复原状态"""
+        enabled = self._log_enabled
+        self._log_enabled = False
+        try:
+            yield self
+        finally:
+            self._log_enabled = enabled
 
     def register_blocks(self, blocks: List[Block]):
         for b in blocks: self.block_templates[b.name] = b
+        self._exported_blocks = None
 
     def export_all_blocks(self) -> List[Dict]:
         """导出所有注册节点的配置描述"""
-        return [b.export_config() for b in self.block_templates.values()]
+        if self._exported_blocks is None:
+            self._exported_blocks = [b.export_config() for b in self.block_templates.values()]
+        return self._exported_blocks
 
 
     def set_schema(self, schema: Dict[str, Any]):
         self.log("🛠️  正在修复预编译逻辑以支持多重连接...")
         
-        # --- 使用 MultiDiGraph 而不是 DiGraph ---
-        temp_graph = nx.MultiDiGraph() 
+        # --- 邻接表 + 入度表（支持同一对节点间的多重连接） ---
+        # adj: 源节点 -> [目标节点]
+        adj: Dict[str, List[str]] = defaultdict(list)
+        # in_edges: 目标节点 -> [(源节点, 源端口, 目标端口)]，按连接顺序保存
+        in_edges: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        in_deg: Dict[str, int] = {}
         self.instances = {}
-        port_to_node = {} 
+        # 端口 ID -> (节点 ID, 端口名)，输出端口与输入端口分开登记
+        out_ports: Dict[str, Tuple[str, str]] = {}
+        in_ports: Dict[str, Tuple[str, str]] = {}
 
-        # 1. 节点实例化
+        # 1. 节点实例化（循环内用到的属性与方法提前取到局部变量）
+        get_template = self.block_templates.get
+        instances = self.instances
         for node_data in schema["nodes"]:
-            t_name = node_data["type"]
             n_id = node_data["id"]
-            template = self.block_templates.get(t_name)
+            template = get_template(node_data["type"])
             
             if not template:
                 continue
 
-            instance = copy.deepcopy(template)
+            instance = template.clone()
             instance.instance_id = n_id
-            self.instances[n_id] = instance
-            temp_graph.add_node(n_id)
+            instances[n_id] = instance
+            in_deg[n_id] = 0
 
+            options = instance._options
             for key, info in node_data.get("inputs", {}).items():
-                p_id = info["id"]
-                if key in instance._options:
+                if key in options:
                     instance.set_option(key, info.get("value"))
                 else:
-                    port_to_node[p_id] = (n_id, key)
+                    in_ports[info["id"]] = (n_id, key)
 
             for key, info in node_data.get("outputs", {}).items():
-                port_to_node[info["id"]] = (n_id, key)
+                out_ports[info["id"]] = (n_id, key)
 
-        # 2. 建立逻辑连接
+        # 2. 建立逻辑连接（多重连接各自保留，不会覆盖旧边）
         for conn in schema["connections"]:
-            src = port_to_node.get(conn["from"])
-            dst = port_to_node.get(conn["to"])
+            src = out_ports.get(conn["from"])
+            dst = in_ports.get(conn["to"])
             if src and dst:
-                # --- 核心修改 2: MultiDiGraph 的 add_edge 不会覆盖旧边 ---
-                temp_graph.add_edge(src[0], dst[0], out_p=src[1], in_p=dst[1])
+                src_id, out_p = src
+                dst_id, in_p = dst
+                adj[src_id].append(dst_id)
+                in_edges[dst_id].append((src_id, out_p, in_p))
+                in_deg[dst_id] += 1
 
-        # 3. 环路检测 (MultiDiGraph 同样支持)
-        try:
-            nx.find_cycle(temp_graph, orientation="original")
-            raise ValueError("Flowchart contains cycles")
-        except nx.NetworkXNoCycle:
-            pass
+        # 3. Kahn 拓扑排序，输出节点数不足即存在环路
+        if not adj:
+            # 无有效连线：节点互不依赖，按声明顺序执行，无需排序
+            execution_order = list(in_deg)
+        else:
+            ready = deque(n_id for n_id, d in in_deg.items() if d == 0)
+            execution_order = []
+            while ready:
+                n_id = ready.popleft()
+                execution_order.append(n_id)
+                for dst_id in adj.get(n_id, ()):
+                    in_deg[dst_id] -= 1
+                    if in_deg[dst_id] == 0:
+                        ready.append(dst_id)
 
-        # 4. 生成指令序列
-        self._compiled_sequence = []
-        # 注意：topological_sort 在 MultiDiGraph 上工作正常
-        execution_order = list(nx.topological_sort(temp_graph))
-        
+            if len(execution_order) < len(self.instances):
+                raise ValueError("Flowchart contains cycles")
+
+        # 4. 生成链接计划
+        self._link_plan = []
         for n_id in execution_order:
-            current_instance = self.instances[n_id]
-            transfers = []
-            
-            # --- 核心修改 3: 遍历所有入边 (in_edges)，处理多重连接 ---
-            # data=True 会返回我们存储在 edge 中的属性字典
-            for pred_id, _, edge_data in temp_graph.in_edges(n_id, data=True):
-                out_p = edge_data["out_p"]
-                in_p = edge_data["in_p"]
-                transfers.append((self.instances[pred_id], out_p, in_p))
-            
-            self._compiled_sequence.append((current_instance, transfers))
+            edges = tuple(in_edges.get(n_id, ()))
+            # 前驱节点 ID 在编译期确定：多端口扇入的同一前驱只记一次（保持连接顺序，
+            # 不用 frozenset 以免字符串哈希随机化导致调度顺序不稳定）
+            parent_ids = tuple(dict.fromkeys(pred_id for pred_id, _, _ in edges))
+            self._link_plan.append((n_id, edges, parent_ids))
 
-        self.log(f"✅ 编译完成。执行序列中包含多重数据流转指令。")
+        # 5. 异步调度表：入度计数 + 后继下标
+        index_of = {n_id: i for i, (n_id, _, _) in enumerate(self._link_plan)}
+        self._in_degrees = [len(parent_ids) for _, _, parent_ids in self._link_plan]
+        self._successors = [[] for _ in self._link_plan]
+        for i, (_, _, parent_ids) in enumerate(self._link_plan):
+            for p_id in parent_ids:
+                self._successors[index_of[p_id]].append(i)
 
-    def run(self, execution_id: str = None):
+        # 6. 绑定端口字典，生成执行序列与同步指令流
+        self._link()
+
+        self.log("✅ 编译完成。执行序列中包含多重数据流转指令。")
+
+    def run(self, execution_id: str = None, parallel: bool = False, max_workers: int = None):
         """
         同步执行：针对工业主循环优化，达到 O(1) 调度性能
         
         Args:
             execution_id: 执行ID，用于追踪输出文件
+            parallel: 是否用线程池并行执行互不依赖的节点（节点需线程安全，默认关闭）
+            max_workers: 并行时的线程数，默认由 ThreadPoolExecutor 决定
         """
-        self.log("🚀 开始同步执行流程...")
+        if parallel:
+            self._run_parallel(execution_id, max_workers)
+            return
+
+        log_enabled = self._log_enabled
+        log = self.log
+        if log_enabled: log("🚀 开始同步执行流程...")
+        compute = None
+        # 异常处理整体放在循环外，正常路径保持直线执行；出错节点即循环变量 compute 绑定的实例
         try:
-            for block, transfers in self._compiled_sequence:
-                # 1. 极致高效的数据流转（纯内存指针访问）
-                for src_block, src_port, dst_port in transfers:
-                    block._inputs[dst_port] = src_block._outputs.get(src_port)
-                
-                # 2. 执行计算
-                try:
-                    block.on_compute(execution_id)
-                    self.log(f"✅ 节点 {block.name} [{block.instance_id}] 执行完成")
-                except Exception as e:
-                    self.log(f"💥 节点 {block.name} [{block.instance_id}] 执行出错: {e}")
-                    raise e
-            self.log("✨ 流程全部同步执行完毕")
+            if not (log_enabled and self.verbose):
+                # 快速路径：扁平指令流，循环体只剩数据搬运与计算调用
+                for compute, transfers in self._run_steps:
+                    for src_get, src_port, dst_inputs, dst_port in transfers:
+                        dst_inputs[dst_port] = src_get(src_port)
+                    compute(execution_id)
+            else:
+                for block, compute, transfers, _ in self._compiled_sequence:
+                    # 1. 极致高效的数据流转（纯内存指针访问）
+                    for src_get, src_port, dst_inputs, dst_port in transfers:
+                        dst_inputs[dst_port] = src_get(src_port)
+
+                    # 2. 执行计算
+                    compute(execution_id)
+                    log("✅ 节点 %s [%s] 执行完成", block.name, block.instance_id)
+            if log_enabled: log("✨ 流程全部同步执行完毕")
         except Exception as e:
-            self.log(f"🛑 流程运行异常终止")
+            if log_enabled:
+                block = compute.__self__
+                log("💥 节点 %s [%s] 执行出错: %s", block.name, block.instance_id, e)
+                log("🛑 流程运行异常终止")
+
+    def _run_parallel(self, execution_id: str, max_workers: int):
+        """
+        线程池并行执行：与 async_run 相同的入度计数调度，就绪节点提交到线程池
+        NumPy 等释放 GIL 的计算可真正多核并行；任一节点出错后不再提交新节点
+        """
+        log_enabled = self._log_enabled
+        log = self.log
+        node_log = log_enabled and self.verbose
+        if log_enabled: log("🚀 开始线程池并行执行...")
+
+        sequence = self._compiled_sequence
+        successors = self._successors
+        remaining = list(self._in_degrees)
+        error = None
+
+        def execute_node(i: int):
+            _, compute, transfers, _ = sequence[i]
+            for src_get, src_port, dst_inputs, dst_port in transfers:
+                dst_inputs[dst_port] = src_get(src_port)
+            compute(execution_id)
+
+        with ThreadPoolExecutor(max_workers) as pool:
+            running: Dict[Future, int] = {
+                pool.submit(execute_node, i): i for i, degree in enumerate(remaining) if degree == 0
+            }
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    block = sequence[i][0]
+                    exc = future.exception()
+                    if exc is not None:
+                        if error is None:
+                            error = exc
+                            if log_enabled: log("💥 节点 %s [%s] 执行出错: %s", block.name, block.instance_id, exc)
+                        continue
+                    if node_log: log("✅ 节点 %s [%s] 执行完成", block.name, block.instance_id)
+                    if error is not None:
+                        continue
+                    for j in successors[i]:
+                        remaining[j] -= 1
+                        if remaining[j] == 0:
+                            running[pool.submit(execute_node, j)] = j
+
+        if error is not None:
+            if log_enabled: log("🛑 流程运行异常终止")
+        elif log_enabled:
+            log("✨ 流程全部并行执行完毕")
 
     async def async_run(self, execution_id: str = None):
         """
-        异步执行：基于 Event 驱动的最大化并行调度
-        
+        异步执行：基于入度计数的最大化并行调度
+        节点完成回调中递减后继入度，归零即启动：每个节点创建任务，同步 on_compute
+        经 asyncio.to_thread 放到线程池，计算期间事件循环保持响应；仅显式声明
+        runs_inline 的轻量节点（常量、转发）在回调内直接执行。任一节点出错即取消其余在途任务
+
         Args:
             execution_id: 执行ID，用于追踪输出文件
         """
-        self.log("🚀 开始异步并行执行...")
-        
-        # 1. 准备所有节点的事件
-        done_events = {n_id: asyncio.Event() for n_id in self.instances}
-
-        async def execute_node(n_id: str, block: Block, transfers: List[Tuple[Block, str, str]]):
-            # 2. 等待当前节点的所有前驱节点完成
-            # 我们通过 transfers 列表直接获取依赖的源 Block
-            if transfers:
-                # 提取所有源 Block 的 instance_id
-                # dependency_ids = [src_b.instance_id for src_b, _, _ in transfers]
-
-                # 去重
-                dependency_ids = list({src_b.instance_id for src_b, _, _ in transfers})
-
-                # 并行等待这些 ID 对应的 Event
-                await asyncio.gather(*(done_events[dep_id].wait() for dep_id in dependency_ids))
-
-            # 3. 静态数据搬运（此时前驱节点已确保 outputs 就绪）
-            for src_block, src_port, dst_port in transfers:
-                block._inputs[dst_port] = src_block._outputs.get(src_port)
-
-            # 4. 执行异步计算逻辑
-            try:
-                # 调用 Block 的异步执行接口
-                await block.async_on_compute(execution_id)
-                self.log(f"✅ 节点 {block.name} [{block.instance_id}] 执行完成")
-            except Exception as e:
-                self.log(f"💥 节点 {block.name} [{block.instance_id}] 执行出错: {e}")
-                raise e # 向上抛出以触发 gather 的异常终止
-            finally:
-                # 无论成功失败都必须 set，防止下游节点永久死锁
-                done_events[n_id].set()
-
-        # 5. 启动所有任务
+        log_enabled = self._log_enabled
+        log = self.log
+        node_log = log_enabled and self.verbose
+        if log_enabled: log("🚀 开始异步并行执行...")
+
+        sequence = self._compiled_sequence
+        successors = self._successors
+        remaining = list(self._in_degrees)
+        running: Dict[asyncio.Task, int] = {}
+        # 已就绪的 runs_inline 轻量节点，由 drain 逐个同步执行
+        inline: deque = deque()
+
+        async def execute_node(block: Block, transfers: List[Transfer]):
+            # 1. 静态数据搬运（入度归零时前驱节点已确保 outputs 就绪）
+            for src_get, src_port, dst_inputs, dst_port in transfers:
+                dst_inputs[dst_port] = src_get(src_port)
+
+            # 2. 执行异步计算逻辑（异常由调度循环统一处理）
+            await block.async_on_compute(execution_id)
+            if node_log: log("✅ 节点 %s [%s] 执行完成", block.name, block.instance_id)
+
+        loop = asyncio.get_running_loop()
+        # 全部节点结束（或首个异常）时完成，主协程只等待这一个 Future
+        finished = loop.create_future()
+        errors: List[BaseException] = []
+
+        def on_done(task: asyncio.Task):
+            # 任务完成回调：直接递减后继入度并启动就绪节点，无需轮询 asyncio.wait
+            i = running.pop(task)
+            if finished.done():
+                # 调度已结束（出错或被取消），仅取走异常避免 "never retrieved" 警告
+                if not task.cancelled():
+                    task.exception()
+                return
+            if task.cancelled():
+                exc = asyncio.CancelledError()
+            else:
+                exc = task.exception()
+            if exc is not None:
+                fail(i, exc)
+                return
+            complete(i)
+            drain()
+
+        def fail(i: int, exc: BaseException):
+            errors.append(exc)
+            if log_enabled:
+                block = sequence[i][0]
+                log("💥 节点 %s [%s] 执行出错: %s", block.name, block.instance_id, exc)
+            inline.clear()
+            finished.set_result(None)
+
+        def complete(i: int):
+            for j in successors[i]:
+                remaining[j] -= 1
+                if remaining[j] == 0:
+                    spawn(j)
+
+        def drain():
+            # runs_inline 节点开销可忽略，包成任务只增加调度开销，直接在当前回调中执行；
+            # 其余节点（含 NumPy/SciPy 计算）一律走任务，不在事件循环上同步运行
+            while inline:
+                i = inline.popleft()
+                block, compute, transfers, _ = sequence[i]
+                try:
+                    for src_get, src_port, dst_inputs, dst_port in transfers:
+                        dst_inputs[dst_port] = src_get(src_port)
+                    compute(execution_id)
+                except Exception as exc:
+                    fail(i, exc)
+                    return
+                if node_log: log("✅ 节点 %s [%s] 执行完成", block.name, block.instance_id)
+                complete(i)
+            if not running:
+                finished.set_result(None)
+
+        def spawn(i: int):
+            block, _, transfers, _ = sequence[i]
+            if block._runs_inline:
+                inline.append(i)
+                return
+            task = loop.create_task(execute_node(block, transfers))
+            running[task] = i
+            task.add_done_callback(on_done)
+
+        # 3. 启动所有入度为 0 的节点
+        for i, degree in enumerate(remaining):
+            if degree == 0:
+                spawn(i)
+        drain()
+
+        # 4. 等待调度结束
+        # 结构化并发（等价 TaskGroup，兼容 3.10）：首个异常取消其余任务，退出前回收全部任务
         try:
-            # 直接从预编译序列创建任务，保证数据一致性
-            async_tasks = [
-                execute_node(block.instance_id, block, transfers)
-                for block, transfers in self._compiled_sequence
-            ]
-            
-            await asyncio.gather(*async_tasks)
-            self.log("✨ 异步流程全部执行完毕")
-        except Exception as e:
-            self.log(f"🛑 异步运行中断: {e}")
+            await finished
+        finally:
+            if running:
+                pending = list(running)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        error = errors[0] if errors else None
+        if error is not None:
+            if log_enabled: log("🛑 异步运行中断: %s", error)
+        elif log_enabled:
+            log("✨ 异步流程全部执行完毕")
 
 
 # TODO
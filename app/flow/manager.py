@@ -1,14 +1,32 @@
 import hashlib
-import json
+import orjson
 import asyncio
-import copy
+import queue
 import threading
-from collections import deque
 from typing import Dict, List, Any, Optional
 from cachetools import LRUCache
 from flow.engine import ComputeEngine
 from utils.singleton import singleton
 
+
+def _canonicalize(schema: Dict) -> List:
+    """
+    提取影响编译结果的字段：节点 (id, 类型, 输入端口/参数, 输出端口) 与连线 (from, to)
+    坐标、标题等纯界面字段不参与哈希；节点与连线保持原顺序（决定执行顺序与多重连接覆盖顺序）
+    """
+    nodes = [
+        [
+            node.get("id"),
+            node.get("type"),
+            [[key, info.get("id"), info.get("value")] for key, info in node.get("inputs", {}).items()],
+            [[key, info.get("id")] for key, info in node.get("outputs", {}).items()],
+        ]
+        for node in schema.get("nodes", ())
+    ]
+    connections = [[conn.get("from"), conn.get("to")] for conn in schema.get("connections", ())]
+    return [nodes, connections]
+
+
 @singleton
 class EngineManager:
     def __init__(self, pool_size: int = 10, blueprint_size: int = 100):
@@ -18,13 +36,19 @@ class EngineManager:
         # 2. 核心缓存：预编译蓝图 (LRU)
         self._blueprints = LRUCache(maxsize=blueprint_size)
         
-        # 3. 实例池：{ schema_hash: deque([ComputeEngine]) }
-        self._instance_pools: Dict[str, deque] = {}
+        # 3. 实例池：{ schema_hash: SimpleQueue[ComputeEngine] }，借还由队列自身的 C 级锁保证线程安全
+        self._instance_pools: Dict[str, queue.SimpleQueue] = {}
         self._pool_max = pool_size
+
+        # 哈希缓存：{ id(schema): (schema, hash) }，持有 schema 引用保证 id 不被复用
+        # 约定：提交后的 schema 字典不再修改
+        self._hash_cache = LRUCache(maxsize=blueprint_size)
         
         # 4. 双重锁机制
-        # 线程锁保护同步操作（线程安全）
+        # 线程锁保护同步操作（线程安全），只包住字典/池的读写，不包含编译
         self._lock = threading.Lock()
+        # 同步编译锁：防止多线程重复编译同一蓝图，编译期间不阻塞池的借还
+        self._compile_lock = threading.Lock()
         # 异步锁保护蓝图初始化逻辑（协程安全，防止惊群效应）
         self._async_lock = asyncio.Lock()
 
@@ -33,9 +57,22 @@ class EngineManager:
             self._block_libraries[business_id] = blocks
 
     def _get_hash(self, business_id: str, schema: Dict) -> str:
-        # 进行排序序列化
-        s_str = json.dumps(schema, sort_keys=True)
-        return hashlib.md5(f"{business_id}:{s_str}".encode()).hexdigest()
+        key = (business_id, id(schema))
+        with self._lock:
+            cached = self._hash_cache.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        # 仅对规范化后的图结构序列化；哈希仅作缓存键，blake2b 比 md5 更快，分段喂入避免字符串拼接
+        # orjson 直接输出 UTF-8 bytes，省去 json.dumps 的纯 Python 排序与 encode
+        h = hashlib.blake2b(digest_size=16)
+        h.update(business_id.encode())
+        h.update(b":")
+        h.update(orjson.dumps(_canonicalize(schema), option=orjson.OPT_SORT_KEYS))
+        s_hash = h.hexdigest()
+        with self._lock:
+            self._hash_cache[key] = (schema, s_hash)
+        return s_hash
 
     # --- 异步接口层 ---
     async def acquire(self, business_id: str, schema: Dict) -> "ScopedEngine":
@@ -56,7 +93,7 @@ class EngineManager:
         
         # 同步环境下直接检查并创建蓝图
         if s_hash not in self._blueprints:
-            with self._lock:
+            with self._compile_lock:
                 if s_hash not in self._blueprints:
                     self._create_blueprint_internal(business_id, schema, s_hash)
         
@@ -70,30 +107,36 @@ class EngineManager:
         
         bp = ComputeEngine()
         bp.register_blocks(self._block_libraries[biz_id])
-        # 拓扑排序与环路检测在此处一次性完成
+        # 拓扑排序与环路检测在此处一次性完成（Kahn 算法，无 networkx 开销）
         bp.set_schema(schema)
         
-        self._blueprints[s_hash] = bp
-        self._instance_pools[s_hash] = deque()
+        # 仅发布结果时持有全局锁；蓝图被 LRU 淘汰后重建时沿用已有的实例池
+        with self._lock:
+            self._blueprints[s_hash] = bp
+            self._instance_pools.setdefault(s_hash, queue.SimpleQueue())
 
     def _get_instance(self, s_hash: str) -> "ComputeEngine":
         """从池中弹出实例或从蓝图克隆"""
+        # SimpleQueue 借出无需全局锁
+        try:
+            return self._instance_pools[s_hash].get_nowait()
+        except queue.Empty:
+            pass
+        # LRUCache 读取会调整顺序，需在锁内取出蓝图引用
         with self._lock:
-            pool = self._instance_pools[s_hash]
-            if pool:
-                return pool.popleft()
-            # 池空时执行克隆，此操作依然在锁内以保证蓝图对象不被竞争访问
-            return copy.deepcopy(self._blueprints[s_hash])
+            blueprint = self._blueprints[s_hash]
+        # 蓝图编译后只读，克隆放在锁外，避免并发请求在克隆上串行排队
+        return blueprint.clone()
 
     def _return_instance(self, s_hash: str, engine: "ComputeEngine"):
         """归还实例前重置数据，并入池"""
         for inst in engine.instances.values():
             inst.reset()
         
-        with self._lock:
-            pool = self._instance_pools.get(s_hash)
-            if pool is not None and len(pool) < self._pool_max:
-                pool.append(engine)
+        # 容量检查允许并发时短暂超出上限，换取归还路径不加全局锁
+        pool = self._instance_pools.get(s_hash)
+        if pool is not None and pool.qsize() < self._pool_max:
+            pool.put_nowait(engine)
 
 # ==========================================
 # 5. 上下文管理器封装（严谨资源回收）
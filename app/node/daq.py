@@ -18,16 +18,20 @@ License: MIT
 import math
 import time
 import logging
-import json
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 from pathlib import Path
 
 import numpy as np
+import orjson
 import pandas as pd
+import scipy.fft as sfft
 import scipy.signal as signal
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.interpolate import interp1d
 
 from flow.block import Block
@@ -52,6 +56,9 @@ class DAQConfig:
 
     # 性能
     ENABLE_CACHE = True
+    # 频谱计算的信号精度：ADC 数据不需要双精度，float32 使 FFT 运算量与内存带宽减半
+    # （时间轴、频率轴仍保持 float64，避免长序列下的时间分辨率损失）
+    SIGNAL_DTYPE = np.float32
     PARALLEL_THRESHOLD = 10000  # 数据点数超过此值时启用并行处理
 
     # 日志
@@ -89,9 +96,15 @@ class DataType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SignalMetadata:
-    """信号元数据类 - 工业级数据结构"""
+    """
+    信号元数据类 - 工业级数据结构
+
+    使用 __slots__：每帧都会创建实例，省去实例 __dict__；
+    字段须在类中声明，不能再动态添加属性。
+    实例不可变（修改字段请用 with_updates 生成新实例），to_dict 结果可以安全缓存
+    """
 
     # 基础信息
     fs: float = 51200.0  # 采样率 (Hz)
@@ -106,6 +119,7 @@ class SignalMetadata:
     # 采集信息
     channel: Optional[int] = None  # 通道号
     sensor_type: Optional[str] = None  # 传感器类型
+    direction: Optional[str] = None  # 测量方向（如径向振动 X/Y）
 
     # 处理信息
     window_type: Optional[str] = None  # 窗口类型
@@ -115,6 +129,8 @@ class SignalMetadata:
     # 频域信息
     df: Optional[float] = None  # 频率分辨率
     freq_range: Optional[Tuple[float, float]] = None  # 频率范围
+    average: Optional[str] = None  # 谱平均方式
+    average_count: Optional[int] = None  # 参与平均的谱数
 
     # 阶次信息
     rpm: Optional[float] = None  # 转速
@@ -125,11 +141,32 @@ class SignalMetadata:
     # 其他
     description: Optional[str] = None  # 描述
     tags: List[str] = field(default_factory=list)  # 标签
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # 创建时间：构造时只记录 time.time_ns()，到 to_dict 时才格式化为 ISO 字符串
+    # （从字典还原的实例保留原字符串）
+    created_at: Union[int, str] = field(default_factory=time.time_ns)
+
+    # to_dict 结果缓存（不参与构造、比较与序列化）
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（首次计算后缓存，返回副本，调用方修改不影响缓存）"""
+        d = self._dict_cache
+        if d is None:
+            d = {name: getattr(self, name) for name in _META_FIELDS}
+            if isinstance(self.created_at, int):
+                d["created_at"] = datetime.fromtimestamp(
+                    self.created_at / 1e9
+                ).isoformat()
+            object.__setattr__(self, "_dict_cache", d)
+        d = d.copy()
+        d["tags"] = list(d["tags"])
+        return d
+
+    def with_updates(self, **changes: Any) -> "SignalMetadata":
+        """返回修改了指定字段的新实例"""
+        return replace(self, **changes)
 
     def validate(self) -> bool:
         """验证元数据有效性"""
@@ -140,7 +177,10 @@ class SignalMetadata:
         return True
 
 
-@dataclass
+_META_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(SignalMetadata) if f.init)
+
+
+@dataclass(slots=True)
 class SignalData:
     """
     统一信号数据结构 - 核心数据格式
@@ -150,13 +190,13 @@ class SignalData:
     3. 简单格式: {"data": [...]}
     """
 
-    # 标准XY数据
+    # 标准XY数据（块之间直接传递 ndarray，只在序列化边界转换）
 
-    x: List[float] = field(default_factory=list)
+    x: Union[np.ndarray, List[float]] = field(default_factory=list)
 
-    y: List[float] = field(default_factory=list)
+    y: Union[np.ndarray, List[float]] = field(default_factory=list)
 
-    # 元数据
+    # 元数据（构造时必须传 SignalMetadata 实例；字典格式在 from_dict 中转换）
 
     meta: SignalMetadata = field(default_factory=SignalMetadata)
 
@@ -168,15 +208,14 @@ class SignalData:
 
     special_data: Optional[Any] = None
 
-    def __post_init__(self):
-        """初始化后处理"""
-
-        if isinstance(self.meta, dict):
-
-            self.meta = SignalMetadata(**self.meta)
+    def to_dict(self, as_list: bool = False) -> Dict[str, Any]:
+        """
+        转换为字典
 
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典（用于JSON序列化）"""
+        Args:
+            as_list: 是否把 ndarray 转为 Python 列表（交给标准 json 等只认列表的消费者时使用；
+                     块之间传递保持 ndarray，JSON 输出优先用模块级 to_json）
+        """
 
         # 如果有特殊数据（如OrderMap），直接返回特殊格式
 
@@ -186,9 +225,14 @@ class SignalData:
 
         # 标准XY格式
 
+        x, y = self.x, self.y
+        if as_list:
+            x = x.tolist() if isinstance(x, np.ndarray) else x
+            y = y.tolist() if isinstance(y, np.ndarray) else y
+
         return {
             "type": self.type,
-            "data": {"x": self.x, "y": self.y, "meta": self.meta.to_dict()},
+            "data": {"x": x, "y": y, "meta": self.meta.to_dict()},
         }
 
     @classmethod
@@ -318,6 +362,7 @@ class ConfigError(DAQError):
 
 
 # ==================== 工具函数 ====================
+# 以下标量工具只用于参数设置等逐次调用的路径，不要在逐采样点的循环或向量化计算中调用
 
 
 def validate_fs(fs: float) -> float:
@@ -344,6 +389,142 @@ def calculate_fs_from_time_axis(t: np.ndarray) -> float:
     return 1.0 / dt
 
 
+def _json_default(obj: Any) -> Any:
+    # orjson 无法直接写出的对象：非连续数组、NumPy 标量等
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
+
+def to_json(obj: Any) -> str:
+    """序列化为 JSON 字符串：连续的 NumPy 数组由 orjson 直接按缓冲区写出，不经过 Python 列表"""
+    return orjson.dumps(
+        obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+@lru_cache(maxsize=64)
+def _rfft_freqs(n: int, fs: float) -> np.ndarray:
+    """频率轴缓存：同一帧长与采样率重复出现时直接复用（只读数组）"""
+    freqs = np.fft.rfftfreq(n, 1.0 / fs)
+    freqs.flags.writeable = False
+    return freqs
+
+
+@lru_cache(maxsize=32)
+def _get_highpass_sos(order: int, cutoff: float, fs: float) -> np.ndarray:
+    """高通 Butterworth 滤波器系数缓存（二阶节形式，只读），相同参数只设计一次"""
+    sos = signal.butter(order, cutoff / (fs / 2), "high", output="sos")
+    sos.flags.writeable = False
+    return sos
+
+
+@lru_cache(maxsize=64)
+def _get_butter_sos(
+    order: int, wn: Union[float, Tuple[float, ...]], btype: str
+) -> np.ndarray:
+    """Butterworth 滤波器系数缓存（二阶节形式，只读），wn 为归一化频率（带通/带阻时为元组）"""
+    sos = signal.butter(order, wn, btype=btype, output="sos")
+    sos.flags.writeable = False
+    return sos
+
+
+@lru_cache(maxsize=32)
+def _get_highpass_ir(order: int, cutoff: float, fs: float, n: int) -> np.ndarray:
+    """高通滤波器前 n 点单位冲激响应缓存（只读），稀疏冲击直接叠加移位响应，不必整段滤波"""
+    impulse = np.zeros(n)
+    impulse[0] = 1.0
+    # 缓存系数只读，scipy 的 sosfilt 内核要求可写缓冲，传入副本
+    ir = signal.sosfilt(_get_highpass_sos(order, cutoff, fs).copy(), impulse)
+    ir.flags.writeable = False
+    return ir
+
+
+@lru_cache(maxsize=32)
+def _get_window(n: int, win_type: str) -> np.ndarray:
+    """窗口函数缓存（只读），流式数据下相同窗长与类型只计算一次"""
+    if win_type == "hann":
+        window = np.hanning(n)
+    elif win_type == "hamming":
+        window = np.hamming(n)
+    elif win_type == "blackman":
+        window = np.blackman(n)
+    elif win_type == "flattop":
+        window = signal.windows.flattop(n)
+    else:
+        window = np.ones(n)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=16)
+def _get_decimation_fir(q: int) -> np.ndarray:
+    """抗混叠 FIR 系数缓存（与 signal.decimate(ftype='fir') 的默认设计相同）"""
+    taps = signal.firwin(20 * q + 1, 1.0 / q, window="hamming")
+    taps.flags.writeable = False
+    return taps
+
+
+def decimate(y: np.ndarray, q: int) -> np.ndarray:
+    """
+    零相位 FIR 抽取（等价于 signal.decimate(y, q, ftype='fir')，滤波器系数按 q 缓存）
+
+    输出长度为 ceil(len(y) / q)，与 y[::q] 对齐。
+    两端按直线外延填充（padtype="line"），默认的零填充会把首尾拉向 0 并引起振铃
+    """
+    if q <= 1:
+        return y
+    return signal.resample_poly(
+        y, 1, q, window=_get_decimation_fir(q), padtype="line"
+    )
+
+
+def amplitude_spectrum(
+    y: np.ndarray, fs: float, normalize: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    单边幅值谱（rfft 只计算非冗余的一半频点）
+
+    Args:
+        y: 实数时域信号，二维时按最后一维逐行计算
+        fs: 采样率（阶次谱时为每转采样点数）
+        normalize: 是否做幅值修正（2/N，直流与奈奎斯特频点不翻倍）
+
+    Returns:
+        (频率轴, 幅值) 元组，频率轴为只读缓存数组
+    """
+    n = np.shape(y)[-1]
+    # scipy.fft 复用变换计划，二维输入时多行并行计算
+    mag = np.abs(sfft.rfft(y, axis=-1, workers=-1))
+    if normalize:
+        # 原地缩放，避免额外的临时数组
+        mag *= 2.0 / n
+        mag[..., 0] *= 0.5
+        if n % 2 == 0:
+            mag[..., -1] *= 0.5
+    return _rfft_freqs(n, float(fs)), mag
+
+
+def rising_edge_times(x: np.ndarray, y: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    脉冲上升沿的精确时刻（相邻两点间线性内插，整段向量化计算）
+
+    Args:
+        x: 时间轴
+        y: 脉冲信号
+        threshold: 触发阈值
+
+    Returns:
+        各上升沿穿越阈值的时刻
+    """
+    idx = np.flatnonzero((y[:-1] < threshold) & (y[1:] >= threshold))
+    x0, x1 = x[idx], x[idx + 1]
+    y0, y1 = y[idx], y[idx + 1]
+    return x0 + (threshold - y0) * (x1 - x0) / (y1 - y0)
+
+
 def safe_divide(a: float, b: float, default: float = 0.0) -> float:
     """安全除法"""
     if b == 0:
@@ -355,6 +536,71 @@ def safe_divide(a: float, b: float, default: float = 0.0) -> float:
 # ==================== AdlinkBridge - 工业级采集卡桥接类 ====================
 
 
+def _as_list(value: Any) -> Any:
+    """把（可能嵌套在字典/列表中的）ndarray 转为 Python 列表"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: _as_list(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_as_list(v) for v in value]
+    return value
+
+
+@dataclass
+class ResultFrames:
+    """
+    按列存放的结果帧
+
+    各帧来自不同的块，长度不一，无法拼成二维数组；x/y 按帧保存数组引用，
+    名称与元数据各占一列，汇总或绘图时按列遍历即可，不必逐帧做字典查找。
+    非 XY 格式的帧（如 OrderMap）原样放在 special 列，x/y/meta 置 None。
+    """
+
+    name: List[str] = field(default_factory=list)
+    x: List[Any] = field(default_factory=list)
+    y: List[Any] = field(default_factory=list)
+    meta: List[Any] = field(default_factory=list)
+    special: List[Any] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def append(self, payload: Dict[str, Any]) -> None:
+        """追加一帧 {"name": ..., "value": {"x": ..., "y": ..., "meta": ...}}"""
+        value = payload.get("value")
+        self.name.append(payload.get("name"))
+        if isinstance(value, dict) and "x" in value and "y" in value:
+            self.x.append(value["x"])
+            self.y.append(value["y"])
+            self.meta.append(value.get("meta"))
+            self.special.append(None)
+        else:
+            self.x.append(None)
+            self.y.append(None)
+            self.meta.append(None)
+            self.special.append(value)
+
+    def clear(self) -> None:
+        self.name.clear()
+        self.x.clear()
+        self.y.clear()
+        self.meta.clear()
+        self.special.clear()
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """还原为逐帧字典列表，ndarray 转为 Python 列表（与标准 json 兼容）"""
+        return [
+            {
+                "name": n,
+                "value": _as_list(s)
+                if x is None
+                else {"x": _as_list(x), "y": _as_list(y), "meta": m},
+            }
+            for n, x, y, m, s in zip(self.name, self.x, self.y, self.meta, self.special)
+        ]
+
+
 class AdlinkBridge:
     """
     工业级采集卡数据桥接类
@@ -382,10 +628,10 @@ class AdlinkBridge:
         # 数据存储
         self.ch_data: Optional[Dict[int, SignalData]] = None
 
-        # 结果数据（供前端显示）
-        self.data_t: List[Dict[str, Any]] = []
-        self.data_p: List[Dict[str, Any]] = []
-        self.data_xy: List[Dict[str, Any]] = []
+        # 结果数据（供前端显示，按列存放）
+        self.data_t: ResultFrames = ResultFrames()
+        self.data_p: ResultFrames = ResultFrames()
+        self.data_xy: ResultFrames = ResultFrames()
 
         # 状态
         self._initialized: bool = False
@@ -438,6 +684,35 @@ class AdlinkBridge:
         # 生成模拟数据
         return self._generate_simulated_data(channel)
 
+    def get_channels_data_batch(self, channels: List[int]) -> Dict[int, SignalData]:
+        """
+        批量获取多个通道数据
+
+        模拟数据的主要开销在释放 GIL 的 NumPy/SciPy 内核中，
+        缺失的通道交给线程池并行生成
+
+        Args:
+            channels: 通道号列表
+
+        Returns:
+            {通道号: SignalData}
+        """
+        result: Dict[int, SignalData] = {}
+        missing: List[int] = []
+        for channel in channels:
+            if self.ch_data is not None and channel in self.ch_data:
+                result[channel] = self.ch_data[channel]
+            else:
+                missing.append(channel)
+
+        if len(missing) == 1:
+            result[missing[0]] = self._generate_simulated_data(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+                generated = ex.map(self._generate_simulated_data, missing)
+                result.update(zip(missing, generated))
+        return result
+
     def _generate_simulated_data(self, channel: int) -> SignalData:
         """
         生成模拟数据（用于调试和演示）
@@ -449,6 +724,8 @@ class AdlinkBridge:
             模拟的SignalData对象
         """
         try:
+            # 每次调用独立的随机数生成器，多线程并行时不争用全局 RandomState 的锁
+            rng = np.random.default_rng()
             # 模拟参数
             count = 1000
             fs = (
@@ -473,7 +750,7 @@ class AdlinkBridge:
             # 根据通道类型生成数据
             if channel in [0, 1, 2, 3]:  # 振动通道
                 y = self._generate_vibration_signal(
-                    t, instantaneous_freq, torsional_phase, fs, count
+                    t, instantaneous_freq, torsional_phase, fs, count, rng
                 )
                 data_type = DataType.VIBRATION.value
                 unit = "um"
@@ -504,7 +781,7 @@ class AdlinkBridge:
                 description=f"模拟通道 {channel} 数据",
             )
 
-            return SignalData(x=t.tolist(), y=y.tolist(), meta=meta, type="time")
+            return SignalData(x=t, y=y, meta=meta, type="time")
 
         except Exception as e:
             logger.error(f"生成模拟数据失败 (通道 {channel}): {e}")
@@ -517,6 +794,7 @@ class AdlinkBridge:
         torsional_phase: np.ndarray,
         fs: float,
         count: int,
+        rng: np.random.Generator,
     ) -> np.ndarray:
         """生成振动信号"""
         # 基础振动分量
@@ -524,15 +802,14 @@ class AdlinkBridge:
             1.0 * np.sin(2 * np.pi * instantaneous_freq * t + torsional_phase)  # 1阶
             + 0.3 * np.sin(2 * np.pi * 2 * instantaneous_freq * t)  # 2阶
             + 0.1 * np.sin(2 * np.pi * 5 * instantaneous_freq * t)  # 5阶
-            + 0.2 * np.random.randn(count)  # 白噪声
+            + 0.2 * rng.standard_normal(count)  # 白噪声
         )
 
-        # 模拟轴承故障冲击
-        impacts = np.zeros(count)
-        impact_times = np.random.choice(count, size=8, replace=False)
-        impacts[impact_times] = 3.0
-        impacts = signal.lfilter(*signal.butter(4, 2000 / (fs / 2), "high"), impacts)
-        y += impacts
+        # 模拟轴承故障冲击：只有 8 个非零冲击，滤波结果等于各冲击处移位叠加的冲激响应
+        # （与对整段稀疏序列做 sosfilt 完全一致，响应取满 count 点，无截断误差）
+        ir = _get_highpass_ir(4, 2000.0, fs, count)
+        for i in rng.choice(count, size=8, replace=False):
+            y[i:] += 3.0 * ir[: count - i]
 
         return y
 
@@ -540,35 +817,31 @@ class AdlinkBridge:
         self, t: np.ndarray, instantaneous_rpm: np.ndarray, fs: float
     ) -> np.ndarray:
         """生成脉冲信号"""
-        pulse_times = []
-        current_angle = 0.0
-        for i in range(len(t)):
-            deg_per_sec = instantaneous_rpm[i] * 6
-            current_angle += deg_per_sec / fs
-            if current_angle >= 360:
-                pulse_times.append(t[i])
-                current_angle -= 360
+        # 累计转角，每跨过一个 360° 整周即产生一个脉冲（每个采样点转角增量远小于一周）
+        current_angle = np.cumsum(instantaneous_rpm * 6 / fs)
+        revs = np.floor(current_angle / 360)
+        # 直接取跨周的采样下标，不再经时间轴换算回下标（避免 t*fs 取整误差落到前一个点）
+        pulse_idx = np.flatnonzero(np.diff(revs, prepend=0.0) > 0)
 
         y = np.zeros(len(t))
-        pulse_idx = [int(pt * fs) for pt in pulse_times if pt < t[-1]]
-        y[pulse_idx] = 5.0
+        y[pulse_idx[pulse_idx < len(t) - 1]] = 5.0
 
         return y
 
     def add_data_t(self, data_t: Dict[str, Any]) -> None:
         """收集时域结果"""
         self.data_t.append(data_t)
-        logger.debug(f"已添加时域数据: {len(data_t)} 个数据点")
+        logger.debug("已添加时域数据: %d 个数据点", len(data_t))
 
     def add_data_p(self, data_p: Dict[str, Any]) -> None:
         """收集频域结果"""
         self.data_p.append(data_p)
-        logger.debug(f"已添加频域数据: {len(data_p)} 个数据点")
+        logger.debug("已添加频域数据: %d 个数据点", len(data_p))
 
     def add_data_xy(self, data_xy: Dict[str, Any]) -> None:
         """收集其他结果（如阶次域）"""
         self.data_xy.append(data_xy)
-        logger.debug(f"已添加XY数据: {len(data_xy)} 个数据点")
+        logger.debug("已添加XY数据: %d 个数据点", len(data_xy))
 
     def reset(self) -> None:
         """重置状态"""
@@ -592,15 +865,12 @@ class AdlinkBridge:
 
     def get_result_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """获取并清空结果数据"""
-        ret = {
-            "t": self.data_t.copy(),
-            "p": self.data_p.copy(),
-            "xy": self.data_xy.copy(),
-        }
-        self.data_t.clear()
-        self.data_p.clear()
-        self.data_xy.clear()
-        return ret
+        # 直接交出当前缓冲并换上新缓冲，避免逐周期复制后再清空
+        frames = {"t": self.data_t, "p": self.data_p, "xy": self.data_xy}
+        self.data_t = ResultFrames()
+        self.data_p = ResultFrames()
+        self.data_xy = ResultFrames()
+        return {k: v.to_records() for k, v in frames.items()}
 
     def init_card(self) -> None:
         """初始化采集卡（模拟）"""
@@ -700,9 +970,9 @@ class BaseBlock(Block):
         x = extracted.get("x", [])
         y = extracted.get("y", [])
 
-        # 如果x为空但y不为空，生成索引作为x
-        if not x and y:
-            x = list(range(len(y)))
+        # 如果x为空但y不为空，生成索引作为x（x/y 可能是 ndarray，不能直接做真值判断）
+        if len(x) == 0 and len(y) > 0:
+            x = np.arange(len(y))
 
         return x, y
 
@@ -803,7 +1073,10 @@ class BaseBlock(Block):
             "name": self.name,
             "compute_count": self._compute_count,
             "error_count": self._error_count,
-            "error_rate": safe_divide(self._error_count, self._compute_count, 0.0),
+            # 前端轮询频繁，直接内联除零判断；未计算过时比率为 0 属正常，不记警告
+            "error_rate": (
+                self._error_count / self._compute_count if self._compute_count else 0.0
+            ),
         }
 
 
@@ -853,6 +1126,64 @@ class ChannelSource(BaseBlock):
             raise
 
 
+class MultiChannelSource(BaseBlock):
+    """
+    从模拟采集卡批量获取多个通道数据
+
+    所选通道通过一次 get_channels_data_batch 调用取得，缺失的通道由线程池并行生成
+
+    输入：无
+    输出：最多 4 路通道信号数据
+    """
+
+    CHANNELS = 4
+
+    def __init__(self):
+        super().__init__("MultiChannelSource", category="输入")
+        for k in range(1, self.CHANNELS + 1):
+            self.add_output(f"O-List-XY-{k}")
+        self.add_checkbox_option("启用", default=True)
+        items = ["无"] + [f"Channel {i}" for i in range(8)]
+        for k in range(1, self.CHANNELS + 1):
+            self.add_select_option(f"通道 {k}", items=items, default=f"Channel {k - 1}")
+
+    def on_compute(self, execution_id: Optional[str] = None):
+        """执行计算"""
+        if not self.get_option("启用"):
+            self._logger.debug("通道未启用，跳过计算")
+            return
+
+        try:
+            # 输出序号 -> 通道号，未选择的输出保持为空
+            selected: Dict[int, int] = {}
+            for k in range(1, self.CHANNELS + 1):
+                choice = self.get_option(f"通道 {k}")
+                if choice and choice != "无":
+                    selected[k] = int(choice.split(" ")[1])
+
+            batch = adlink_bridge_instance.get_channels_data_batch(
+                list(dict.fromkeys(selected.values()))
+            )
+
+            for k, channel_idx in selected.items():
+                data = batch.get(channel_idx)
+                if data is None:
+                    self._logger.warning(f"通道 {channel_idx} 无数据")
+                    continue
+
+                is_valid, msg = data.validate()
+                if not is_valid:
+                    raise DataValidationError(f"通道 {channel_idx} 数据验证失败: {msg}")
+
+                self.set_interface(f"O-List-XY-{k}", data.to_dict())
+
+            self._logger.debug(f"成功批量获取通道 {sorted(set(selected.values()))} 数据")
+
+        except Exception as e:
+            self._log_error(e, "批量通道")
+            raise
+
+
 class TurbineSimulator(BaseBlock):
     """
     核电汽轮机高精度扭振模拟器 (V2.0 修正版)
@@ -914,6 +1245,8 @@ class TurbineSimulator(BaseBlock):
             dt = 1.0 / fs
             t = np.arange(0, T, dt)
             N = len(t)
+            # 每次计算独立的随机数生成器：比全局 RandomState 快，且多实例并行时无锁争用
+            rng = np.random.default_rng()
 
             # ==========================================
             # 物理层级 1: 刚体转速与波动
@@ -943,14 +1276,12 @@ class TurbineSimulator(BaseBlock):
                 2 * np.pi * (2 * grid_freq) * t
             )
 
-            # 总瞬时角速度 (包含所有波动)
-            w_total = (
-                w_nom
-                + w_drift
-                + w_torsion_mode1
-                + w_torsion_elec
-                + np.random.normal(0, 0.01, N)
-            )
+            # 总瞬时角速度 (包含所有波动)，在噪声缓冲上原地累加，不生成中间数组
+            w_total = rng.normal(0.0, 0.01, N)
+            w_total += w_nom
+            w_total += w_drift
+            w_total += w_torsion_mode1
+            w_total += w_torsion_elec
 
             # ==========================================
             # 物理层级 3: 相位积分与信号生成
@@ -960,15 +1291,22 @@ class TurbineSimulator(BaseBlock):
 
             # 1. 生成键相脉冲 (PPR 决定齿数)
             # 利用相位生成 TTL 脉冲，脉冲宽度设为 1/4 齿宽
-            pulse_phase = (phase_accum * ppr / (2 * np.pi)) % 1.0
-            pulse = np.where(pulse_phase < 0.25, 5.0, 0.0)
+            teeth = phase_accum * (ppr / (2 * np.pi))  # 累计通过的齿数
+            # TTL 电平只有 0/5 V，用 float32 承载：布尔掩码直接转换后原地缩放，
+            # 写出的字节数比 np.where 生成的 float64 减半
+            pulse = (np.mod(teeth, 1.0) < 0.25).astype(np.float32)
+            pulse *= 5.0
 
             # 2. 计算瞬时 RPM 真值
             rpm_instant = w_total * 60.0 / (2 * np.pi)
 
             # 3. 计算【每齿平均转速】 O-AvgRPM-XY (关键修正)
-            # 寻找上升沿索引
-            rising_edges = np.where((pulse[:-1] < 2.5) & (pulse[1:] >= 2.5))[0]
+            # 上升沿只会出现在累计齿数跨过整数处：相位单调递增，直接二分查找跨齿采样点，
+            # 不再扫描整段脉冲；再按脉冲电平确认（欠采样时一个采样点可能跨过多个齿）
+            whole_teeth = np.arange(1, int(teeth[-1]) + 1)
+            cross = np.unique(np.searchsorted(teeth, whole_teeth))
+            cross = cross[cross > 0]
+            rising_edges = cross[pulse[cross] > pulse[cross - 1]] - 1  # 对齐到沿前一点
             if len(rising_edges) > 1:
                 t_edges = t[rising_edges]
                 dt_edges = np.diff(t_edges)  # 相邻齿通过的时间差
@@ -979,26 +1317,41 @@ class TurbineSimulator(BaseBlock):
                 t_rpm_avg, rpm_avg_val = [], []
 
             # 4. 生成两路正交的径向振动信号
-            # X方向振动
-            vibration_x = (
-                amp_1x * np.sin(phase_accum)
-                + (amp_1x * 0.3) * np.sin(2 * phase_accum)
-                + 2.0 * np.sin(bpf_num * phase_accum)
-                + np.random.normal(0, 0.5, N)
-            )
-            
+            # 三角函数只算基频与叶片通过频率各一对 sin/cos：
+            # Y 方向相位偏移 90 度即 sin(x+π/2)=cos(x)，二倍频由二倍角公式相乘得到
+            sin_1x = np.sin(phase_accum)
+            cos_1x = np.cos(phase_accum)
+            bpf_phase = bpf_num * phase_accum
+            sin_bpf = np.sin(bpf_phase)
+            cos_bpf = np.cos(bpf_phase, out=bpf_phase)
+
+            # 各分量经同一个临时缓冲原地累加到噪声数组上，
+            # 每路振动只多占一块 N 长的内存，不再逐项生成临时数组
+            tmp = np.empty(N)
+
+            # X方向振动: amp*sin + 0.3*amp*sin(2x) + 2*sin(bpf) + 噪声
+            vibration_x = rng.normal(0.0, 0.5, N)
+            vibration_x += np.multiply(sin_1x, amp_1x, out=tmp)
+            np.multiply(sin_1x, cos_1x, out=tmp)
+            tmp *= amp_1x * 0.6
+            vibration_x += tmp
+            vibration_x += np.multiply(sin_bpf, 2.0, out=tmp)
+
             # Y方向振动（与X正交，相位偏移90度）
-            vibration_y = (
-                amp_1x * np.sin(phase_accum + np.pi/2)
-                + (amp_1x * 0.3) * np.sin(2 * phase_accum + np.pi/2)
-                + 2.0 * np.sin(bpf_num * phase_accum + np.pi/2)
-                + np.random.normal(0, 0.5, N)
-            )
+            # cos(2x) = (cos+sin)(cos-sin)；sin_bpf 已用完，作为第二个缓冲
+            vibration_y = rng.normal(0.0, 0.5, N)
+            vibration_y += np.multiply(cos_1x, amp_1x, out=tmp)
+            np.add(cos_1x, sin_1x, out=sin_bpf)
+            np.subtract(cos_1x, sin_1x, out=tmp)
+            tmp *= sin_bpf
+            tmp *= amp_1x * 0.3
+            vibration_y += tmp
+            vibration_y += np.multiply(cos_bpf, 2.0, out=tmp)
 
             # ==========================================
             # 数据封装输出 - 使用SignalData格式
             # ==========================================
-            # 基础元数据
+            # 基础元数据（各路输出用 dataclasses.replace 派生，只改动差异字段）
             base_meta = SignalMetadata(
                 fs=fs,
                 domain=DomainType.TIME.value,
@@ -1007,28 +1360,25 @@ class TurbineSimulator(BaseBlock):
             )
 
             # O-Pulse-XY
-            pulse_meta = SignalMetadata(**base_meta.to_dict())
-            pulse_meta.data_type = DataType.PULSE.value
-            pulse_meta.unit = "V"
-            pulse_meta.ppr = ppr
+            pulse_meta = replace(
+                base_meta, data_type=DataType.PULSE.value, unit="V", ppr=ppr
+            )
             self.set_interface(
                 "O-Pulse-XY",
-                SignalData(
-                    x=t.tolist(), y=pulse.tolist(), meta=pulse_meta, type="pulse"
-                ).to_dict(),
+                SignalData(x=t, y=pulse, meta=pulse_meta, type="pulse").to_dict(),
             )
 
             # O-InstantRPM-XY (物理真值，建议降采样显示以免卡顿)
             ds = 10 if fs > 5000 else 1
-            rpm_meta = SignalMetadata(**base_meta.to_dict())
-            rpm_meta.data_type = DataType.RPM.value
-            rpm_meta.unit = "RPM"
-            rpm_meta.fs = fs / ds  # 更新采样率
+            rpm_meta = replace(
+                base_meta, data_type=DataType.RPM.value, unit="RPM", fs=fs / ds
+            )
+            # 先抗混叠滤波再抽取，避免直接跨步取点造成的混叠；结果保持 ndarray
             self.set_interface(
                 "O-InstantRPM-XY",
                 SignalData(
-                    x=t[::ds].tolist(),
-                    y=rpm_instant[::ds].tolist(),
+                    x=np.ascontiguousarray(t[::ds]),
+                    y=decimate(rpm_instant, ds),
                     meta=rpm_meta,
                     type="rpm",
                 ).to_dict(),
@@ -1036,54 +1386,54 @@ class TurbineSimulator(BaseBlock):
 
             # O-AvgRPM-XY (算法观测值)
             if len(t_rpm_avg) > 0:
-                avg_rpm_meta = SignalMetadata(**base_meta.to_dict())
-                avg_rpm_meta.data_type = DataType.RPM.value
-                avg_rpm_meta.unit = "RPM"
-                avg_rpm_meta.description = "Computed per tooth"
+                avg_rpm_meta = replace(
+                    base_meta,
+                    data_type=DataType.RPM.value,
+                    unit="RPM",
+                    description="Computed per tooth",
+                )
                 self.set_interface(
                     "O-AvgRPM-XY",
                     SignalData(
-                        x=t_rpm_avg.tolist(),
-                        y=rpm_avg_val.tolist(),
+                        x=t_rpm_avg,
+                        y=rpm_avg_val,
                         meta=avg_rpm_meta,
                         type="rpm",
                     ).to_dict(),
                 )
 
             # O-VibrationX-XY
-            vib_x_meta = SignalMetadata(**base_meta.to_dict())
-            vib_x_meta.data_type = DataType.VIBRATION.value
-            vib_x_meta.unit = "um"
-            vib_x_meta.direction = "X"
+            vib_x_meta = replace(
+                base_meta, data_type=DataType.VIBRATION.value, unit="um", direction="X"
+            )
             self.set_interface(
                 "O-VibrationX-XY",
                 SignalData(
-                    x=t.tolist(), y=vibration_x.tolist(), meta=vib_x_meta, type="vibration"
+                    x=t, y=vibration_x, meta=vib_x_meta, type="vibration"
                 ).to_dict(),
             )
 
             # O-VibrationY-XY
-            vib_y_meta = SignalMetadata(**base_meta.to_dict())
-            vib_y_meta.data_type = DataType.VIBRATION.value
-            vib_y_meta.unit = "um"
-            vib_y_meta.direction = "Y"
+            vib_y_meta = replace(
+                base_meta, data_type=DataType.VIBRATION.value, unit="um", direction="Y"
+            )
             self.set_interface(
                 "O-VibrationY-XY",
                 SignalData(
-                    x=t.tolist(), y=vibration_y.tolist(), meta=vib_y_meta, type="vibration"
+                    x=t, y=vibration_y, meta=vib_y_meta, type="vibration"
                 ).to_dict(),
             )
 
             # O-Torsional-XY (交流扭振分量)
             torsional_ac = w_torsion_mode1 + w_torsion_elec
-            tors_meta = SignalMetadata(**base_meta.to_dict())
-            tors_meta.data_type = DataType.TORSIONAL.value
-            tors_meta.unit = "rad/s"
+            tors_meta = replace(
+                base_meta, data_type=DataType.TORSIONAL.value, unit="rad/s"
+            )
             self.set_interface(
                 "O-Torsional-XY",
                 SignalData(
-                    x=t.tolist(),
-                    y=torsional_ac.tolist(),
+                    x=t,
+                    y=torsional_ac,
                     meta=tors_meta,
                     type="torsional",
                 ).to_dict(),
@@ -1127,8 +1477,23 @@ class CSVReader(BaseBlock):
             if not Path(file_path).exists():
                 raise FileNotFoundError(f"文件不存在: {file_path}")
 
-            # 读取CSV
-            df = pd.read_csv(file_path, header=header)
+            # 有表头且指定了列名时，先只读表头校验列名，避免筛选后得到空表被误报为“文件为空”
+            if header is not None and (x_col or y_col):
+                columns = pd.read_csv(file_path, nrows=0).columns
+                if x_col and x_col not in columns:
+                    raise DataValidationError(f"X列 '{x_col}' 不存在")
+                if y_col and y_col not in columns:
+                    raise DataValidationError(f"Y列 '{y_col}' 不存在")
+
+            # 读取CSV；指定了列名时由 C 解析器直接解析为 float64
+            dtype = {c: np.float64 for c in (x_col, y_col) if c}
+            # X/Y 列都已指定时只解析这两列，其余列在解析阶段即跳过
+            usecols = None
+            if header is not None and x_col and y_col:
+                usecols = [x_col, y_col]
+            df = pd.read_csv(
+                file_path, header=header, dtype=dtype or None, usecols=usecols
+            )
 
             if df.empty:
                 raise DataValidationError("CSV文件为空")
@@ -1136,8 +1501,8 @@ class CSVReader(BaseBlock):
             # 提取数据
             if x_col is None and y_col is None:
                 if len(df.columns) >= 2:
-                    x_data = df.iloc[:, 0].tolist()
-                    y_data = df.iloc[:, 1].tolist()
+                    x_data = df.iloc[:, 0].to_numpy(dtype=np.float64, copy=False)
+                    y_data = df.iloc[:, 1].to_numpy(dtype=np.float64, copy=False)
                 else:
                     raise DataValidationError("CSV文件至少需要2列数据")
             else:
@@ -1146,12 +1511,18 @@ class CSVReader(BaseBlock):
                 if y_col and y_col not in df.columns:
                     raise DataValidationError(f"Y列 '{y_col}' 不存在")
 
-                x_data = df[x_col].tolist() if x_col else list(range(len(df)))
-                y_data = df[y_col].tolist() if y_col else df.iloc[:, 0].tolist()
+                x_data = (
+                    df[x_col].to_numpy(dtype=np.float64, copy=False)
+                    if x_col
+                    else np.arange(len(df), dtype=np.float64)
+                )
+                y_data = (df[y_col] if y_col else df.iloc[:, 0]).to_numpy(
+                    dtype=np.float64, copy=False
+                )
 
             # 计算采样率
             if len(x_data) >= 2:
-                fs = calculate_fs_from_time_axis(np.array(x_data))
+                fs = calculate_fs_from_time_axis(x_data)
             else:
                 fs = DAQConfig.DEFAULT_SAMPLERATE
 
@@ -1180,6 +1551,8 @@ class CSVReader(BaseBlock):
 class ConstantSource(BaseBlock):
     """输出常量值（用于测试或参数注入）"""
 
+    runs_inline = True
+
     def __init__(self):
         super().__init__("ConstantSource", category="输入")
         self.add_text_input_option("常量值", default="0.0")
@@ -1213,6 +1586,8 @@ class XYSplitter(BaseBlock):
     输出：X向量、Y向量
     """
 
+    runs_inline = True
+
     def __init__(self):
         super().__init__("XYSplitter", category="预处理")
         self.add_input("I-List-XY")
@@ -1274,7 +1649,7 @@ class XYMerger(BaseBlock):
 
             # 计算采样率
             if len(x_data) >= 2:
-                fs = calculate_fs_from_time_axis(np.array(x_data))
+                fs = calculate_fs_from_time_axis(np.asarray(x_data))
             else:
                 fs = DAQConfig.DEFAULT_SAMPLERATE
 
@@ -1333,19 +1708,6 @@ class TimeWindow(BaseBlock):
             "输出模式", items=["首个窗口", "全部窗口"], default="首个窗口"
         )
 
-    def _get_window(self, n: int, win_type: str) -> np.ndarray:
-        """获取窗口函数"""
-        if win_type == "hann":
-            return np.hanning(n)
-        elif win_type == "hamming":
-            return np.hamming(n)
-        elif win_type == "blackman":
-            return np.blackman(n)
-        elif win_type == "flattop":
-            return signal.windows.flattop(n)
-        else:
-            return np.ones(n)
-
     def on_compute(self, execution_id: Optional[str] = None):
         """执行计算"""
         try:
@@ -1355,8 +1717,8 @@ class TimeWindow(BaseBlock):
                 return
 
             data = i_data["data"]
-            x = np.array(data["x"])
-            y = np.array(data["y"])
+            x = np.asarray(data["x"])
+            y = np.asarray(data["y"])
             meta = data.get("meta", {})
 
             # 获取采样率
@@ -1380,41 +1742,44 @@ class TimeWindow(BaseBlock):
                 hop = win_len
 
             # 获取窗口函数
-            window = self._get_window(win_len, win_type)
+            window = _get_window(win_len, win_type)
 
-            # 分割数据
-            segments = []
-            for start in range(0, len(y) - win_len + 1, hop):
-                seg_y = y[start : start + win_len] * window
-                seg_x = x[start : start + win_len]
-                segments.append((seg_x, seg_y))
+            # 分割数据：滑动窗口视图按 hop 取行，不复制数据
+            seg_xs = sliding_window_view(x, win_len)[::hop]
+            n_seg = len(seg_xs)
 
-            if not segments:
+            if n_seg == 0:
                 raise ProcessingError("无法生成有效窗口")
 
             # 输出
             if mode == "首个窗口":
-                seg_x, seg_y = segments[0]
+                # 只需要第一个窗口，不必对其余窗口加窗
+                seg_x = seg_xs[0]
+                seg_y = y[:win_len] * window
                 new_meta = SignalMetadata(**meta) if isinstance(meta, dict) else meta
-                new_meta.window_sec = win_sec
-                new_meta.window_type = win_type
+                new_meta = new_meta.with_updates(
+                    window_sec=win_sec, window_type=win_type
+                )
 
                 self.set_interface(
                     "O-List-XY",
                     SignalData(
-                        x=seg_x.tolist(),
-                        y=seg_y.tolist(),
+                        x=seg_x,
+                        y=seg_y,
                         meta=new_meta,
                         type="time_segment",
                     ).to_dict(),
                 )
             else:
                 # 输出多段 - 使用SignalData列表格式
+                # 所有窗口一次广播乘窗函数，得到 (窗口数, 窗长) 矩阵
+                seg_ys = sliding_window_view(y, win_len)[::hop] * window
                 segments_meta = (
                     SignalMetadata(**meta) if isinstance(meta, dict) else meta
                 )
-                segments_meta.window_sec = win_sec
-                segments_meta.window_type = win_type
+                segments_meta = segments_meta.with_updates(
+                    window_sec=win_sec, window_type=win_type
+                )
 
                 self.set_interface(
                     "O-List-XY",
@@ -1423,17 +1788,17 @@ class TimeWindow(BaseBlock):
                         "data": {
                             "segments": [
                                 {
-                                    "x": sx.tolist(),
-                                    "y": sy.tolist(),
+                                    "x": sx,
+                                    "y": sy,
                                     "meta": segments_meta.to_dict(),
                                 }
-                                for sx, sy in segments
+                                for sx, sy in zip(seg_xs, seg_ys)
                             ]
                         },
                     },
                 )
 
-            self._logger.debug(f"时间窗口完成: {len(segments)} 个窗口")
+            self._logger.debug(f"时间窗口完成: {n_seg} 个窗口")
 
         except Exception as e:
             self._log_error(e, "时间窗口")
@@ -1474,8 +1839,8 @@ class SignalFilter(BaseBlock):
                 return
 
             data = i_data["data"]
-            x = np.array(data["x"])
-            y = np.array(data["y"])
+            x = np.asarray(data["x"])
+            y = np.asarray(data["y"])
             meta = data.get("meta", {})
 
             # 获取采样率
@@ -1497,28 +1862,26 @@ class SignalFilter(BaseBlock):
                 if f <= 0 or f >= nyquist:
                     raise ConfigError(f"无效的截止频率: {f} (奈奎斯特频率: {nyquist})")
 
-            # 归一化频率
+            # 归一化频率（元组便于作为滤波器缓存的键）
             if filter_type in ["lowpass", "highpass"]:
                 wn = freqs[0] / nyquist
             else:
-                wn = [f / nyquist for f in freqs]
+                wn = tuple(f / nyquist for f in freqs)
 
-            # 设计滤波器
-            b, a = signal.butter(order, wn, btype=filter_type)
+            # 设计滤波器（二阶节形式，高阶时数值稳定；相同参数只设计一次）
+            sos = _get_butter_sos(order, wn, filter_type)
 
-            # 应用滤波器
-            y_filtered = signal.filtfilt(b, a, y)
+            # 应用零相位滤波（scipy 的 sosfilt 内核要求可写缓冲，缓存系数只读，传入副本）
+            y_filtered = signal.sosfiltfilt(sos.copy(), y)
 
             # 创建元数据
             new_meta = SignalMetadata(**meta) if isinstance(meta, dict) else meta
-            new_meta.data_type = DataType.FILTERED.value
+            new_meta = new_meta.with_updates(data_type=DataType.FILTERED.value)
 
             # 输出
             self.set_interface(
                 "O-List-XY",
-                SignalData(
-                    x=x.tolist(), y=y_filtered.tolist(), meta=new_meta, type="filtered"
-                ).to_dict(),
+                SignalData(x=x, y=y_filtered, meta=new_meta, type="filtered").to_dict(),
             )
 
             self._logger.debug(f"滤波完成: {filter_type}, {freq_str} Hz, {order}阶")
@@ -1552,8 +1915,8 @@ class EnvelopeDetector(BaseBlock):
                 return
 
             data = i_data["data"]
-            x = np.array(data["x"])
-            y = np.array(data["y"])
+            x = np.asarray(data["x"])
+            y = np.asarray(data["y"])
             meta = data.get("meta", {})
 
             # 计算解析信号
@@ -1562,14 +1925,12 @@ class EnvelopeDetector(BaseBlock):
 
             # 创建元数据
             new_meta = SignalMetadata(**meta) if isinstance(meta, dict) else meta
-            new_meta.data_type = DataType.ENVELOPE.value
+            new_meta = new_meta.with_updates(data_type=DataType.ENVELOPE.value)
 
             # 输出
             self.set_interface(
                 "O-List-XY",
-                SignalData(
-                    x=x.tolist(), y=envelope.tolist(), meta=new_meta, type="envelope"
-                ).to_dict(),
+                SignalData(x=x, y=envelope, meta=new_meta, type="envelope").to_dict(),
             )
 
             self._logger.debug("包络检测完成")
@@ -1614,8 +1975,8 @@ class FFT(BaseBlock):
             data = i_data["data"]
             meta = data.get("meta", {})
 
-            x = np.array(data["x"])
-            y = np.array(data["y"])
+            x = np.asarray(data["x"])
+            y = np.asarray(data["y"], dtype=DAQConfig.SIGNAL_DTYPE)
 
             # 获取采样率
             fs = meta.get("fs")
@@ -1626,17 +1987,8 @@ class FFT(BaseBlock):
             if N < 2:
                 raise DataValidationError("数据点数不足")
 
-            # 计算FFT
-            fft_vals = np.fft.rfft(y)
-
-            # 幅值修正
-            if self.get_option("幅值修正"):
-                mag = np.abs(fft_vals) / N * 2.0
-            else:
-                mag = np.abs(fft_vals)
-
-            # 频率轴
-            freqs = np.fft.rfftfreq(N, 1.0 / fs)
+            # 计算FFT（含幅值修正与缓存的频率轴）
+            freqs, mag = amplitude_spectrum(y, fs, self.get_option("幅值修正"))
 
             # 创建元数据
             new_meta = SignalMetadata(
@@ -1652,9 +2004,7 @@ class FFT(BaseBlock):
             # 输出
             self.set_interface(
                 "O-List-XY",
-                SignalData(
-                    x=freqs.tolist(), y=mag.tolist(), meta=new_meta, type="spectrum"
-                ).to_dict(),
+                SignalData(x=freqs, y=mag, meta=new_meta, type="spectrum").to_dict(),
             )
 
             self._logger.debug(f"FFT完成: {N} 点, 频率分辨率 {fs/N:.2f} Hz")
@@ -1664,6 +2014,88 @@ class FFT(BaseBlock):
             raise
 
 
+class MultiFFT(BaseBlock):
+    """
+    多通道批量FFT
+
+    功能：
+    - 点数与采样率相同的通道堆叠为二维数组，一次 rfft(axis=-1) 完成
+    - 单边幅值谱
+    - 幅值修正
+
+    输入：最多 4 路时域信号
+    输出：对应的 4 路频域信号
+    """
+
+    CHANNELS = 4
+
+    def __init__(self):
+        super().__init__("MultiFFT", category="分析")
+
+        for k in range(1, self.CHANNELS + 1):
+            self.add_input(f"I-List-XY-{k}")
+        for k in range(1, self.CHANNELS + 1):
+            self.add_output(f"O-List-XY-{k}")
+
+        self.add_checkbox_option("幅值修正", default=True)
+
+    def on_compute(self, execution_id: Optional[str] = None):
+        """执行计算"""
+        try:
+            # 按 (点数, 采样率) 分组，同组通道共享一次批量 FFT
+            groups: Dict[Tuple[int, float], List[Tuple[int, np.ndarray, Dict[str, Any]]]] = {}
+
+            for k in range(1, self.CHANNELS + 1):
+                i_data = self.get_interface(f"I-List-XY-{k}")
+                if i_data is None or not self._validate_input_data(i_data):
+                    continue
+
+                data = i_data["data"]
+                meta = data.get("meta", {})
+                y = np.asarray(data["y"], dtype=DAQConfig.SIGNAL_DTYPE)
+
+                fs = meta.get("fs")
+                if fs is None:
+                    fs = calculate_fs_from_time_axis(np.asarray(data["x"]))
+
+                if len(y) < 2:
+                    raise DataValidationError(f"通道 {k} 数据点数不足")
+
+                groups.setdefault((len(y), float(fs)), []).append((k, y, meta))
+
+            normalize = self.get_option("幅值修正")
+
+            for (N, fs), items in groups.items():
+                freqs, mag = amplitude_spectrum(
+                    np.stack([y for _, y, _ in items]), fs, normalize
+                )
+
+                for row, (k, _, meta) in zip(mag, items):
+                    new_meta = SignalMetadata(
+                        fs=fs,
+                        unit="V",
+                        domain=DomainType.FREQUENCY.value,
+                        data_type=DataType.SPECTRUM.value,
+                        df=fs / N,
+                        window_sec=meta.get("window_sec"),
+                        description=f"FFT频谱 (通道 {k})",
+                    )
+                    self.set_interface(
+                        f"O-List-XY-{k}",
+                        SignalData(
+                            x=freqs, y=row, meta=new_meta, type="spectrum"
+                        ).to_dict(),
+                    )
+
+            self._logger.debug(
+                f"批量FFT完成: {sum(len(v) for v in groups.values())} 通道, {len(groups)} 组"
+            )
+
+        except Exception as e:
+            self._log_error(e, "批量FFT")
+            raise
+
+
 # ==================== Analysis Blocks ====================
 
 
@@ -1704,31 +2136,39 @@ class SpectralAverager(BaseBlock):
             if len(specs) == 0:
                 raise DataValidationError("频谱列表为空")
 
-            # 提取数据
-            Y = np.array([s["y"] for s in specs])
-            X = np.array(specs[0]["x"])
+            X = np.asarray(specs[0]["x"])
 
-            # 计算平均
+            # 计算平均：单遍累加到一个频谱长度的缓冲，不拼接 (频谱数, 频点数) 矩阵
             mode = self.get_option("平均方式")
+            n = len(specs)
+
+            acc = np.array(specs[0]["y"], dtype=np.float64)
+            if mode == "RMS":
+                acc *= acc
+            for s in specs[1:]:
+                arr = np.asarray(s["y"])
+                if mode == "线性":
+                    acc += arr
+                elif mode == "RMS":
+                    acc += arr * arr
+                else:  # 峰值保持
+                    np.maximum(acc, arr, out=acc)
 
             if mode == "线性":
-                y_avg = np.mean(Y, axis=0)
+                y_avg = acc / n
             elif mode == "RMS":
-                y_avg = np.sqrt(np.mean(Y**2, axis=0))
-            else:  # 峰值保持
-                y_avg = np.max(Y, axis=0)
+                y_avg = np.sqrt(acc / n)
+            else:
+                y_avg = acc
 
             # 创建元数据
             new_meta = SignalMetadata(**meta) if isinstance(meta, dict) else meta
-            new_meta.average = mode
-            new_meta.average_count = len(specs)
+            new_meta = new_meta.with_updates(average=mode, average_count=len(specs))
 
             # 输出
             self.set_interface(
                 "O-Spectrum",
-                SignalData(
-                    x=X.tolist(), y=y_avg.tolist(), meta=new_meta, type="spectrum"
-                ).to_dict(),
+                SignalData(x=X, y=y_avg, meta=new_meta, type="spectrum").to_dict(),
             )
 
             self._logger.debug(f"频谱平均完成: {len(specs)} 个频谱, {mode} 平均")
@@ -1762,7 +2202,7 @@ class Stats(BaseBlock):
             if not self._validate_input_data(i_data):
                 return
 
-            y = np.array(i_data["data"].get("y", []))
+            y = np.asarray(i_data["data"].get("y", []))
 
             if len(y) == 0:
                 raise DataValidationError("数据为空")
@@ -1821,27 +2261,18 @@ class TachoToRPM(BaseBlock):
             if not self._validate_input_data(i_data):
                 return
 
-            x = np.array(i_data["data"]["x"])
-            y = np.array(i_data["data"]["y"])
+            x = np.asarray(i_data["data"]["x"])
+            y = np.asarray(i_data["data"]["y"])
 
             ppr = self.get_option("每转脉冲数 (PPR)")
             threshold = self.get_option("脉冲阈值 (V)")
             win = self.get_option("滑动脉冲数")
 
-            # 上升沿检测 + 线性内插
-            idx = np.where((y[:-1] < threshold) & (y[1:] >= threshold))[0]
-
-            if len(idx) < win + 1:
-                raise DataValidationError(f"脉冲不足: {len(idx)} < {win + 1}")
+            # 上升沿检测 + 线性内插求精确时刻
+            t_edge = rising_edge_times(x, y, threshold)
 
-            # 线性内插求精确时刻
-            t_edge = []
-            for i in idx:
-                t0, t1 = x[i], x[i + 1]
-                y0, y1 = y[i], y[i + 1]
-                t_acc = t0 + (threshold - y0) * (t1 - t0) / (y1 - y0)
-                t_edge.append(t_acc)
-            t_edge = np.array(t_edge)
+            if len(t_edge) < win + 1:
+                raise DataValidationError(f"脉冲不足: {len(t_edge)} < {win + 1}")
 
             # 多脉冲平均转速
             t_start = t_edge[:-win]
@@ -1864,9 +2295,7 @@ class TachoToRPM(BaseBlock):
             # 输出
             self.set_interface(
                 "O-RPM-XY",
-                SignalData(
-                    x=t_mid.tolist(), y=rpm.tolist(), meta=meta, type="rpm"
-                ).to_dict(),
+                SignalData(x=t_mid, y=rpm, meta=meta, type="rpm").to_dict(),
             )
 
             self._logger.debug(f"转速提取完成: {len(rpm)} 个数据点")
@@ -1911,31 +2340,20 @@ class AngularResampler(BaseBlock):
                 return
 
             # 获取数据
-            t_vib = np.array(vib_data["data"]["x"])
-            v_vib = np.array(vib_data["data"]["y"])
-            t_pulse = np.array(pulse_data["data"]["x"])
-            v_pulse = np.array(pulse_data["data"]["y"])
+            t_vib = np.asarray(vib_data["data"]["x"])
+            v_vib = np.asarray(vib_data["data"]["y"])
+            t_pulse = np.asarray(pulse_data["data"]["x"])
+            v_pulse = np.asarray(pulse_data["data"]["y"])
 
             ppr = self.get_option("每转脉冲数 (PPR)")
             res_per_rev = self.get_option("每转采样点数")
             threshold = self.get_option("脉冲触发阈值 (V)")
 
             # 精确提取脉冲边沿时刻（亚采样插值）
-            rising_idx = np.where(
-                (v_pulse[:-1] < threshold) & (v_pulse[1:] >= threshold)
-            )[0]
-
-            if len(rising_idx) < 2:
-                raise DataValidationError(f"脉冲不足: {len(rising_idx)} < 2")
-
-            # 线性内插求精确时刻
-            t_edge = []
-            for idx in rising_idx:
-                t0, t1 = t_pulse[idx], t_pulse[idx + 1]
-                v0, v1 = v_pulse[idx], v_pulse[idx + 1]
-                t_acc = t0 + (threshold - v0) * (t1 - t0) / (v1 - v0)
-                t_edge.append(t_acc)
-            t_edge = np.array(t_edge)
+            t_edge = rising_edge_times(t_pulse, v_pulse, threshold)
+
+            if len(t_edge) < 2:
+                raise DataValidationError(f"脉冲不足: {len(t_edge)} < 2")
 
             # 计算每个脉冲时刻对应的累计角度
             angle_increment = 2 * np.pi / ppr
@@ -1988,8 +2406,8 @@ class AngularResampler(BaseBlock):
             self.set_interface(
                 "O-List-XY",
                 SignalData(
-                    x=target_angle_axis.tolist(),
-                    y=resampled_vibration.tolist(),
+                    x=target_angle_axis,
+                    y=resampled_vibration,
                     meta=meta,
                     type="angular_domain",
                 ).to_dict(),
@@ -2037,11 +2455,11 @@ class RPMTrackedFFT(BaseBlock):
                 self._logger.warning("输入数据不完整")
                 return
 
-            sx = np.array(sig["data"]["x"])
-            sy = np.array(sig["data"]["y"])
+            sx = np.asarray(sig["data"]["x"])
+            sy = np.asarray(sig["data"]["y"])
 
-            rx = np.array(spd["data"]["x"])
-            ry = np.array(spd["data"]["y"])
+            rx = np.asarray(spd["data"]["x"])
+            ry = np.asarray(spd["data"]["y"])
 
             rpm_center = self.get_option("转速中心 (RPM)")
             rpm_bw = self.get_option("转速带宽 (RPM)")
@@ -2073,9 +2491,7 @@ class RPMTrackedFFT(BaseBlock):
             sig_y = sig_y[:N]
 
             # 计算FFT
-            fft_vals = np.fft.rfft(sig_y)
-            mag = np.abs(fft_vals) / N * 2
-            orders = np.fft.rfftfreq(N, 1 / samples_per_rev)
+            orders, mag = amplitude_spectrum(sig_y, samples_per_rev)
 
             # 创建元数据
             meta = SignalMetadata(
@@ -2092,9 +2508,7 @@ class RPMTrackedFFT(BaseBlock):
             # 输出
             self.set_interface(
                 "O-Order-Spectrum",
-                SignalData(
-                    x=orders.tolist(), y=mag.tolist(), meta=meta, type="order_spectrum"
-                ).to_dict(),
+                SignalData(x=orders, y=mag, meta=meta, type="order_spectrum").to_dict(),
             )
 
             self._logger.debug(f"转速跟踪FFT完成: {rpm_center} RPM, {revs} 转")
@@ -2186,38 +2600,33 @@ class OrderMap(BaseBlock):
             )
 
             order_limit = self.get_option("阶次上限")
-            maps = []
 
-            # ========= 5. 每一帧角度 FFT =========
-            for th0 in frame_edges:
-                th1 = th0 + dtheta
+            # 阶次轴只取决于帧长，所有帧共用（缓存的只读数组）
+            order_axis = _rfft_freqs(pts_frame, float(pts_per_rev))
+            valid = order_axis <= order_limit
+            order = order_axis[valid]
 
-                theta_uniform = np.linspace(th0, th1, pts_frame, endpoint=False)
-                x_theta = vib_theta_interp(theta_uniform)
-
-                # 去直流 + 加窗
-                x_theta -= np.mean(x_theta)
-                x_theta *= np.hanning(len(x_theta))
-
-                fft = np.fft.rfft(x_theta)
-                mag = np.abs(fft)
+            # ========= 5. 各帧角度 FFT（批量计算） =========
+            # 所有帧的等角度采样点拼成 (帧数, 帧长) 矩阵，插值、去直流、加窗与 FFT 一次完成
+            theta_uniform = frame_edges[:, None] + np.arange(pts_frame) * (
+                dtheta / pts_frame
+            )
+            x_theta = vib_theta_interp(theta_uniform)
 
-                # 阶次轴
-                order = np.fft.rfftfreq(len(x_theta), d=1 / pts_per_rev)
+            # 去直流 + 加窗
+            x_theta -= x_theta.mean(axis=1, keepdims=True)
+            x_theta *= _get_window(pts_frame, "hann")
 
-                valid = order <= order_limit
+            mags = np.abs(sfft.rfft(x_theta, axis=1, workers=-1))[:, valid]
 
-                # 帧中心转速（仅作为标签）
-                t_center = np.interp((th0 + th1) / 2, theta, t_sig)
-                rpm_center = rpm_interp(t_center)
+            # 帧中心转速（仅作为标签）
+            t_center = np.interp(frame_edges + dtheta / 2, theta, t_sig)
+            rpm_center = rpm_interp(t_center)
 
-                maps.append(
-                    {
-                        "rpm": float(rpm_center),
-                        "order": order[valid].tolist(),
-                        "mag": mag[valid].tolist(),
-                    }
-                )
+            maps = [
+                {"rpm": float(r), "order": order, "mag": mag}
+                for r, mag in zip(rpm_center, mags)
+            ]
 
             if not maps:
                 raise ProcessingError("OrderMap: 无有效帧生成")
@@ -2336,8 +2745,8 @@ class CSVSink(BaseBlock):
             x = data.get("x", [])
             y = data.get("y", [])
 
-            if not x:
-                x = list(range(len(y)))
+            if len(x) == 0:
+                x = np.arange(len(y))
 
             df = pd.DataFrame({"x": x, "y": y})
 
@@ -2446,8 +2855,8 @@ class BaseChartViewer(BaseBlock):
                 point_radius = 1.5
 
             # 生成JSON
-            x_json = json.dumps(x_data)
-            y_json = json.dumps(y_data)
+            x_json = to_json(x_data)
+            y_json = to_json(y_data)
 
             # 获取配置
             file_path = self.get_option("文件路径")
@@ -2718,14 +3127,14 @@ class TrajectoryChartViewer(BaseBlock):
 
             # 提取数据 - 支持多种格式
             if isinstance(data_x, dict) and "data" in data_x:
-                x_data = data_x["data"] if isinstance(data_x["data"], list) else data_x["data"].get("y", [])
+                x_data = data_x["data"] if isinstance(data_x["data"], (list, np.ndarray)) else data_x["data"].get("y", [])
             else:
-                x_data = data_x if isinstance(data_x, list) else []
+                x_data = data_x if isinstance(data_x, (list, np.ndarray)) else []
 
             if isinstance(data_y, dict) and "data" in data_y:
-                y_data = data_y["data"] if isinstance(data_y["data"], list) else data_y["data"].get("y", [])
+                y_data = data_y["data"] if isinstance(data_y["data"], (list, np.ndarray)) else data_y["data"].get("y", [])
             else:
-                y_data = data_y if isinstance(data_y, list) else []
+                y_data = data_y if isinstance(data_y, (list, np.ndarray)) else []
 
             if len(x_data) == 0 or len(y_data) == 0:
                 self._logger.warning("数据为空")
@@ -2819,9 +3228,9 @@ class TrajectoryChartViewer(BaseBlock):
     </div>
 
     <script>
-        const xData = {json.dumps(x_data)};
-        const yData = {json.dumps(y_data)};
-        const timeIndices = {json.dumps(time_indices)};
+        const xData = {to_json(x_data)};
+        const yData = {to_json(y_data)};
+        const timeIndices = {to_json(time_indices)};
         const totalPoints = {len(x_data)};
 
         // 生成颜色数组
@@ -3059,9 +3468,9 @@ class OrderMapChartViewer(BaseBlock):
                 title,
                 width,
                 height,
-                rpm_array.tolist(),
-                order_array.tolist(),
-                mag_array.tolist(),
+                rpm_array,
+                order_array,
+                mag_array,
                 display_mode,
                 show_colorbar,
                 reverse_y,
@@ -3104,9 +3513,9 @@ class OrderMapChartViewer(BaseBlock):
     ) -> str:
         """生成阶次图HTML"""
 
-        rpm_json = json.dumps(rpm_values)
-        order_json = json.dumps(order_values)
-        mag_json = json.dumps(mag_values)
+        rpm_json = to_json(rpm_values)
+        order_json = to_json(order_values)
+        mag_json = to_json(mag_values)
 
         y_axis_direction = "descending" if reverse_y else "ascending"
 
@@ -3300,7 +3709,7 @@ class MQTTPublisher(BaseBlock):
             password = self.get_option("密码 (可选)") or None
 
             # 模拟发布
-            payload = json.dumps(i_data)
+            payload = to_json(i_data)
             self._logger.info(f"MQTT 已模拟发布: {payload[:200]}")
 
             # TODO: 实现真实的MQTT发布
@@ -3349,6 +3758,7 @@ class Logger(BaseBlock):
 daq_blocks = [
     # Source
     ChannelSource(),
+    MultiChannelSource(),
     TurbineSimulator(),
     CSVReader(),
     ConstantSource(),
@@ -3361,6 +3771,7 @@ daq_blocks = [
     TimeWindow(),
     # Transform
     FFT(),
+    MultiFFT(),
     # Analysis
     SpectralAverager(),
     Stats(),
@@ -3398,6 +3809,7 @@ __all__ = [
     "ProcessingError",
     "ConfigError",
     "AdlinkBridge",
+    "ResultFrames",
     "BaseBlock",
     "daq_blocks",
 ]
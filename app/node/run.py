@@ -60,10 +60,25 @@ def make_dynamic_engine(scripts: List[str]):
     return engine_instance
 
 
+# 内置 DAQ 节点模板注册后不再变化，导出结果按进程缓存
+_daq_block_exports: List[dict] = None
+
+
+def _get_daq_block_exports() -> List[dict]:
+    global _daq_block_exports
+    if _daq_block_exports is None:
+        _daq_block_exports = [b.export_config() for b in daq_blocks]
+    return _daq_block_exports
+
+
 def get_json_blocks(scripts: List[str] = None):
     """获取所有 blocks 的 JSON 配置"""
-    script_blocks = get_blocks(scripts)
-    return [b.export_config() for b in script_blocks]
+    script_blocks = _build_blocks(scripts)
+
+    # 脚本节点每次请求重新构建，需实时导出；内置节点直接复用缓存
+    result = [b.export_config() for b in script_blocks]
+    result.extend(_get_daq_block_exports())
+    return result
 
 
 
@@ -11,12 +11,13 @@ LastEditTime: 2026-01-13 08:26:48
 Blocks 路由
 """
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import logging
 import json
+import orjson
 import time
 from datetime import datetime
 
@@ -231,7 +232,8 @@ async def get_blocks():
         # 从数据库加载自定义 blocks
         scripts = await load_scripts_from_db("/")
         blocks = get_json_blocks(scripts)
-        return {"blocks": blocks}
+        # 直接返回 orjson 序列化结果，跳过 jsonable_encoder 的逐层遍历
+        return Response(content=orjson.dumps({"blocks": blocks}), media_type="application/json")
     except Exception as e:
         raise HTTPException(500, f"Failed to get blocks: {str(e)}")
 
@@ -0,0 +1,114 @@
+import json
+
+import numpy as np
+import pytest
+
+from node.daq import (
+    AdlinkBridge,
+    CSVReader,
+    DataValidationError,
+    MultiChannelSource,
+    SignalData,
+    SignalFilter,
+    SignalMetadata,
+    decimate,
+)
+
+
+def test_decimate_constant_speed_stays_constant():
+    rpm = np.full(64000, 1500.0)
+    out = decimate(rpm, 10)
+    assert len(out) == len(rpm[::10])
+    np.testing.assert_allclose(out, 1500.0, rtol=1e-9)
+
+
+def test_decimate_linear_ramp_has_no_edge_ringing():
+    t = np.arange(0, 5.0, 1.0 / 12800.0)
+    rpm = 1500.0 + 20.0 * t
+    out = decimate(rpm, 10)
+    np.testing.assert_allclose(out, rpm[::10], rtol=1e-6)
+
+
+def test_decimate_factor_one_is_passthrough():
+    y = np.arange(10.0)
+    assert decimate(y, 1) is y
+
+
+def _csv_reader(path, x_col, y_col):
+    block = CSVReader()
+    block.set_option("文件路径", str(path))
+    block.set_option("X列名 (可选)", x_col)
+    block.set_option("Y列名 (可选)", y_col)
+    return block
+
+
+@pytest.mark.parametrize(
+    "x_col, y_col, message",
+    [
+        ("time", "missing", "Y列 'missing' 不存在"),
+        ("missing", "value", "X列 'missing' 不存在"),
+        ("nope", "missing", "X列 'nope' 不存在"),
+    ],
+)
+def test_csv_reader_reports_missing_column(tmp_path, x_col, y_col, message):
+    path = tmp_path / "data.csv"
+    path.write_text("time,value\n0.0,1.0\n0.1,2.0\n")
+    with pytest.raises(DataValidationError, match=message):
+        _csv_reader(path, x_col, y_col).on_compute()
+
+
+def test_csv_reader_reads_named_columns(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("time,extra,value\n0.0,9,1.0\n0.1,9,2.0\n")
+    block = _csv_reader(path, "time", "value")
+    block.on_compute()
+    out = block._outputs["O-List-XY"]["data"]
+    np.testing.assert_allclose(out["x"], [0.0, 0.1])
+    np.testing.assert_allclose(out["y"], [1.0, 2.0])
+
+
+def test_multi_channel_source_fetches_selected_channels():
+    block = MultiChannelSource()
+    block.set_option("通道 1", "Channel 2")
+    block.set_option("通道 2", "Channel 5")
+    block.set_option("通道 3", "无")
+    block.on_compute()
+
+    for k in (1, 2):
+        data = block._outputs[f"O-List-XY-{k}"]["data"]
+        assert len(data["x"]) == len(data["y"]) > 0
+    assert block._outputs["O-List-XY-3"] is None
+    assert block._outputs["O-List-XY-4"] is not None
+
+
+def test_result_data_is_plain_json():
+    bridge = AdlinkBridge()
+    bridge.add_data_t({"name": "wave", "value": {"x": np.arange(3.0), "y": np.ones(3), "meta": {}}})
+    bridge.add_data_xy({"name": "map", "value": [{"rpm": 1500.0, "mag": np.zeros(2)}]})
+
+    result = bridge.get_result_data()
+
+    assert json.loads(json.dumps(result)) == {
+        "t": [{"name": "wave", "value": {"x": [0.0, 1.0, 2.0], "y": [1.0, 1.0, 1.0], "meta": {}}}],
+        "p": [],
+        "xy": [{"name": "map", "value": [{"rpm": 1500.0, "mag": [0.0, 0.0]}]}],
+    }
+    assert bridge.get_result_data() == {"t": [], "p": [], "xy": []}
+
+
+def test_signal_filter_runs_twice_with_cached_coefficients():
+    fs = 12800.0
+    t = np.arange(4096) / fs
+    y = np.sin(2 * np.pi * 50 * t) + np.sin(2 * np.pi * 4000 * t)
+    data = SignalData(x=t, y=y, meta=SignalMetadata(fs=fs)).to_dict()
+
+    outs = []
+    for _ in range(2):
+        block = SignalFilter()
+        block._inputs["I-List-XY"] = data
+        block.on_compute()
+        outs.append(np.asarray(block._outputs["O-List-XY"]["data"]["y"]))
+
+    np.testing.assert_allclose(outs[0], outs[1])
+    mid = slice(1000, 3000)
+    np.testing.assert_allclose(outs[0][mid], np.sin(2 * np.pi * 50 * t[mid]), atol=0.02)
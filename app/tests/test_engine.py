@@ -0,0 +1,254 @@
+import asyncio
+import threading
+
+import pytest
+
+from flow.block import Block
+from flow.engine import ComputeEngine
+
+
+class Source(Block):
+    def __init__(self):
+        super().__init__("Source")
+        self.add_number_option("value", default=1.0)
+        self.add_output("out")
+
+    def on_compute(self, execution_id=None):
+        self.set_interface("out", self.get_option("value"))
+
+
+class Scale(Block):
+    def __init__(self):
+        super().__init__("Scale")
+        self.add_number_option("k", default=1.0)
+        self.add_input("in")
+        self.add_output("out")
+        self.add_output("thread")
+
+    def on_compute(self, execution_id=None):
+        self.set_interface("out", self.get_interface("in") * self.get_option("k"))
+        self.set_interface("thread", threading.get_ident())
+
+
+class Offset(Block):
+    runs_inline = True
+
+    def __init__(self):
+        super().__init__("Offset")
+        self.add_input("in")
+        self.add_output("out")
+
+    def on_compute(self, execution_id=None):
+        self.set_interface("out", self.get_interface("in") + 1.0)
+
+
+class AsyncSum(Block):
+    def __init__(self):
+        super().__init__("AsyncSum")
+        self.add_input("a")
+        self.add_input("b")
+        self.add_output("out")
+
+    async def on_compute(self, execution_id=None):
+        self.set_interface("out", self.get_interface("a") + self.get_interface("b"))
+
+
+class Sum(Block):
+    def __init__(self):
+        super().__init__("Sum")
+        self.add_input("a")
+        self.add_input("b")
+        self.add_output("out")
+
+    def on_compute(self, execution_id=None):
+        self.set_interface("out", self.get_interface("a") + self.get_interface("b"))
+
+
+class Fail(Block):
+    def __init__(self):
+        super().__init__("Fail")
+        self.add_input("in")
+        self.add_output("out")
+
+    def on_compute(self, execution_id=None):
+        raise RuntimeError("boom")
+
+
+TEMPLATES = [Source(), Scale(), Offset(), AsyncSum(), Sum(), Fail()]
+
+
+def node(n_id, block_type, inputs=(), outputs=("out",), **options):
+    ports = {k: {"id": f"{n_id}.{k}"} for k in inputs}
+    ports.update({k: {"id": f"{n_id}.{k}", "value": v} for k, v in options.items()})
+    return {
+        "id": n_id,
+        "type": block_type,
+        "inputs": ports,
+        "outputs": {k: {"id": f"{n_id}.{k}"} for k in outputs},
+    }
+
+
+def conn(src, out_p, dst, in_p):
+    return {"from": f"{src}.{out_p}", "to": f"{dst}.{in_p}"}
+
+
+def diamond(right_type="Offset", sink_type="Sum"):
+    """src -> left(x2) / right(+1) -> sink(a + b)"""
+    return {
+        "nodes": [
+            node("sink", sink_type, inputs=("a", "b")),
+            node("left", "Scale", inputs=("in",), outputs=("out", "thread"), k=2.0),
+            node("right", right_type, inputs=("in",)),
+            node("src", "Source", value=3.0),
+        ],
+        "connections": [
+            conn("src", "out", "left", "in"),
+            conn("src", "out", "right", "in"),
+            conn("left", "out", "sink", "a"),
+            conn("right", "out", "sink", "b"),
+        ],
+    }
+
+
+def make_engine(schema, logs=None):
+    engine = ComputeEngine()
+    engine.on_log = logs.append if logs is not None else None
+    engine.register_blocks(TEMPLATES)
+    engine.set_schema(schema)
+    return engine
+
+
+def run_sync(engine):
+    engine.run("exec")
+
+
+def run_parallel(engine):
+    engine.run("exec", parallel=True, max_workers=4)
+
+
+def run_async(engine):
+    asyncio.run(engine.async_run("exec"))
+
+
+MODES = [run_sync, run_parallel, run_async]
+
+
+def outputs(engine):
+    return {n_id: b._outputs["out"] for n_id, b in engine.instances.items()}
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_diamond_outputs_match_across_modes(verbose):
+    results = []
+    for mode in MODES:
+        logs = [] if verbose else None
+        engine = make_engine(diamond(), logs)
+        mode(engine)
+        results.append(outputs(engine))
+
+    assert results[0] == {"src": 3.0, "left": 6.0, "right": 4.0, "sink": 10.0}
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_async_run_awaits_coroutine_nodes():
+    engine = make_engine(diamond(sink_type="AsyncSum"))
+    run_async(engine)
+    assert outputs(engine) == {"src": 3.0, "left": 6.0, "right": 4.0, "sink": 10.0}
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_diamond_error_stops_downstream_in_every_mode(mode):
+    logs = []
+    engine = make_engine(diamond(right_type="Fail"), logs)
+
+    mode(engine)
+
+    assert engine.instances["sink"]._outputs["out"] is None
+    errors = [line for line in logs if "执行出错" in line]
+    assert len(errors) == 1
+    assert "Fail" in errors[0] and "boom" in errors[0]
+
+
+def test_async_run_keeps_sync_compute_off_the_event_loop():
+    engine = make_engine(diamond())
+    loop_thread = []
+
+    async def main():
+        loop_thread.append(threading.get_ident())
+        await engine.async_run("exec")
+
+    asyncio.run(main())
+
+    assert engine.instances["left"]._outputs["thread"] != loop_thread[0]
+    assert Offset._runs_inline and not Scale._runs_inline and not Source._runs_inline
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_schema_without_connections_runs_every_node(mode):
+    schema = {
+        "nodes": [node("a", "Source", value=1.0), node("b", "Source", value=2.0)],
+        "connections": [],
+    }
+    engine = make_engine(schema)
+    mode(engine)
+    assert outputs(engine) == {"a": 1.0, "b": 2.0}
+
+
+def test_cycle_is_rejected():
+    schema = {
+        "nodes": [
+            node("x", "Offset", inputs=("in",)),
+            node("y", "Offset", inputs=("in",)),
+        ],
+        "connections": [conn("x", "out", "y", "in"), conn("y", "out", "x", "in")],
+    }
+    with pytest.raises(ValueError):
+        make_engine(schema)
+
+
+def test_clone_options_are_copy_on_write():
+    engine = make_engine(diamond())
+    clone = engine.clone()
+    clone.instances["left"].set_option("k", 10.0)
+
+    run_sync(engine)
+    run_sync(clone)
+
+    assert engine.instances["left"].get_option("k") == 2.0
+    assert engine.instances["sink"]._outputs["out"] == 10.0
+    assert clone.instances["sink"]._outputs["out"] == 34.0
+    template = engine.block_templates["Scale"]
+    assert template.get_option("k") == 1.0
+    assert template._outputs["out"] is None
+
+
+class Collector(Block):
+    def __init__(self):
+        super().__init__("Collector")
+        self.add_input("in")
+        self.add_output("out")
+        self.history = []
+
+    def on_compute(self, execution_id=None):
+        self.history.append(self.get_interface("in"))
+        self.set_interface("out", len(self.history))
+
+
+def test_clone_isolates_mutable_attributes():
+    template = Collector()
+    a, b = template.clone(), template.clone()
+
+    a.history.append(1.0)
+
+    assert b.history == [] and template.history == []
+    assert a.history is not b.history
+
+
+def test_clone_shares_immutable_attributes():
+    template = Scale()
+    template.label = "scale"
+    clone = template.clone()
+
+    assert clone.label == "scale"
+    assert clone._options["k"] is template._options["k"]